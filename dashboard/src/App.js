@@ -131,7 +131,11 @@ function App() {
           ...update.data
         };
         
-        setVoiceActivities(prev => [activity, ...prev.slice(0, 49)]); // Keep last 50
+        // The finished reply replaces the session's streaming entry
+        setVoiceActivities(prev => [
+          activity,
+          ...prev.filter(a => a.id !== `partial-${update.session_id}`).slice(0, 49)
+        ]); // Keep last 50
         
         // Flash update animation
         setTimeout(() => {
@@ -143,6 +147,20 @@ function App() {
         }, 100);
         break;
       
+      case 'claude_partial': {
+        // One in-progress entry per session, updated in place as the reply streams in
+        const partial = {
+          id: `partial-${update.session_id}`,
+          session_id: update.session_id,
+          timestamp: new Date(update.timestamp),
+          ...update.data
+        };
+        setVoiceActivities(prev => prev.some(a => a.id === partial.id)
+          ? prev.map(a => (a.id === partial.id ? partial : a))
+          : [partial, ...prev.slice(0, 49)]);
+        break;
+      }
+      
       default:
         console.log('Unknown update type:', update.type);
     }
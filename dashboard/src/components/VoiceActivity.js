@@ -15,6 +15,7 @@ const VoiceActivity = ({ activities, selectedSession }) => {
       case 'voice_input':
         return <Mic className="w-4 h-4 text-primary-600" />;
       case 'claude_response':
+      case 'claude_partial':
         return <Bot className="w-4 h-4 text-success-600" />;
       case 'tts_output':
         return <Volume2 className="w-4 h-4 text-warning-600" />;
@@ -28,6 +29,7 @@ const VoiceActivity = ({ activities, selectedSession }) => {
       case 'voice_input':
         return 'border-l-primary-500 bg-primary-50';
       case 'claude_response':
+      case 'claude_partial':
         return 'border-l-success-500 bg-success-50';
       case 'tts_output':
         return 'border-l-warning-500 bg-warning-50';
@@ -49,6 +51,7 @@ const VoiceActivity = ({ activities, selectedSession }) => {
   const ActivityItem = ({ activity }) => {
     const isVoiceInput = activity.action === 'voice_input';
     const isClaudeResponse = activity.action === 'claude_response';
+    const isClaudePartial = activity.action === 'claude_partial';
     
     return (
       <div 
@@ -66,6 +69,7 @@ const VoiceActivity = ({ activities, selectedSession }) => {
                 <span className="text-sm font-medium text-gray-900">
                   {isVoiceInput ? 'Voice Input' : 
                    isClaudeResponse ? 'AI Response' : 
+                   isClaudePartial ? 'AI Responding...' :
                    activity.action.replace('_', ' ').replace(/\b\w/g, l => l.toUpperCase())}
                 </span>
                 {isVoiceInput && activity.confidence && (
@@ -98,6 +102,13 @@ const VoiceActivity = ({ activities, selectedSession }) => {
               </div>
             )}
             
+            {/* Claude reply while it is still streaming */}
+            {isClaudePartial && activity.partial_response && (
+              <p className="text-sm text-gray-900 bg-white p-2 rounded border">
+                {activity.partial_response}
+              </p>
+            )}
+            
             {/* Claude response */}
             {isClaudeResponse && (
               <div className="space-y-2">
@@ -27,6 +27,9 @@ from .batch_mcp_client import batch_mcp_orchestrator
 from .batch_models import BatchOrderRequest, PlaceOrderRequest
 from .taco_search_client import taco_search_client
 
+# Minimum gap between streamed partial replies sent to the dashboard
+PARTIAL_BROADCAST_INTERVAL_S = 0.25
+
 # Create FastAPI app
 app = FastAPI(
     title="Hungry Agent",
@@ -215,7 +218,29 @@ async def process_voice_input(
             context=active_sessions.get(voice_input.session_id, {}).get("current_context")
         )
         
-        claude_response = await claude_client.process_voice_command(claude_request)
+        # Stream the reply so far as one growing dashboard entry, throttled so a long
+        # answer doesn't become a message per token
+        partial_text = ""
+        last_partial = float("-inf")
+        loop = asyncio.get_running_loop()
+        
+        async def broadcast_partial(text: str):
+            nonlocal partial_text, last_partial
+            partial_text += text
+            if loop.time() - last_partial < PARTIAL_BROADCAST_INTERVAL_S:
+                return
+            last_partial = loop.time()
+            await broadcast_update(DashboardUpdate(
+                type="claude_partial",
+                data={
+                    "session_id": voice_input.session_id,
+                    "partial_response": partial_text,
+                    "action": "claude_partial"
+                },
+                session_id=voice_input.session_id
+            ))
+        
+        claude_response = await claude_client.process_voice_command(claude_request, on_text=broadcast_partial)
         
         # Execute any function calls
         mcp_results = []
@@ -561,10 +586,30 @@ async def startup_event():
     # Ensure database tables exist
     db_manager.create_tables()
     
+    # Warm up the taco search MCP server in the background so the first
+    # user request doesn't pay the subprocess start + handshake. Keep a
+    # reference so shutdown can stop it if it is still running
+    app.state.taco_warmup_task = asyncio.create_task(taco_search_client.warmup())
+    
     print("🚀 Hungry Agent orchestrator started")
     print(f"📊 Dashboard available at: http://localhost:{settings.dashboard_port}")
     print(f"🎤 Voice processing ready on port: {settings.orchestrator_port}")
 
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Clean up background MCP servers and API connections on shutdown"""
+    warmup_task = getattr(app.state, "taco_warmup_task", None)
+    if warmup_task is not None:
+        if not warmup_task.done():
+            warmup_task.cancel()
+        try:
+            await warmup_task
+        except asyncio.CancelledError:
+            pass
+    await taco_search_client.close()
+    await claude_client.close()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
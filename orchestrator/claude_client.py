@@ -2,23 +2,255 @@
 Anthropic Claude API client for processing voice commands and generating responses
 """
 
-import json
 import asyncio
-from typing import Dict, List, Any, Optional, AsyncGenerator
+from typing import Dict, List, Any, Optional, AsyncGenerator, Awaitable, Callable
 from datetime import datetime
 
 import anthropic
+import httpx
 from anthropic import AsyncAnthropic
+import orjson
+
+try:
+    import h2  # Optional: lets concurrent Claude calls share one HTTP/2 connection
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 from .config import settings
 from .models import ClaudeRequest, ClaudeResponse, OrderItem, Platform
 
 
+# Keep idle API connections open between voice turns so follow-up calls skip the TCP/TLS handshake
+CLAUDE_CONNECTION_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0)
+
+# Output budget for spoken replies; the system prompt asks for 1-2 sentences, which fit well inside it
+SPOKEN_MAX_TOKENS = 100
+
+# Tool definitions offered to Claude; static, so they form part of the cached prompt prefix
+TOOLS = [
+    {
+        "name": "search_tacos",
+        "description": "Search for taco restaurants using fast database lookup",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search query (e.g., 'tacos', 'Mexican food', restaurant name, or Austin area)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results (default: 10)",
+                    "minimum": 1,
+                    "maximum": 15
+                }
+            },
+            "required": ["query"]
+        }
+    },
+    {
+        "name": "get_restaurant_details",
+        "description": "Get detailed information about a specific taco restaurant including hours, reviews, and best items",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "restaurant_name": {
+                    "type": "string",
+                    "description": "Name of the restaurant to get details for"
+                }
+            },
+            "required": ["restaurant_name"]
+        }
+    },
+    {
+        "name": "get_top_rated_tacos",
+        "description": "Get the top-rated taco restaurants in Austin with high ratings and reviews",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Number of top restaurants to return (default: 5)",
+                    "minimum": 1,
+                    "maximum": 10
+                }
+            }
+        }
+    },
+    {
+        "name": "search_by_area",
+        "description": "Search for taco restaurants in a specific Austin area or neighborhood",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "area": {
+                    "type": "string",
+                    "description": "Austin area, neighborhood, or street name (e.g., 'downtown', 'south austin', 'lamar')"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results (default: 8)",
+                    "minimum": 1,
+                    "maximum": 15
+                }
+            },
+            "required": ["area"]
+        }
+    },
+    {
+        "name": "search_menu_items",
+        "description": "Search for specific taco types or menu items mentioned in reviews (e.g., 'beef', 'al pastor', 'spicy', 'carnitas')",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search term for menu items (e.g., 'beef', 'al pastor', 'spicy', 'carnitas')"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results (default: 15)",
+                    "minimum": 1,
+                    "maximum": 20
+                }
+            },
+            "required": ["query"]
+        }
+    },
+    {
+        "name": "get_menu",
+        "description": "Get menu items from a specific restaurant on Uber Eats",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "restaurant_id": {
+                    "type": "string",
+                    "description": "Restaurant identifier"
+                },
+                "restaurant_name": {
+                    "type": "string",
+                    "description": "Restaurant name"
+                }
+            },
+            "required": ["restaurant_name"]
+        }
+    },
+    {
+        "name": "order_food",
+        "description": "Place an order for specific food items from a restaurant (use after finding items with search tools)",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "restaurant_name": {
+                    "type": "string",
+                    "description": "Name of the restaurant (from search results)"
+                },
+                "item_name": {
+                    "type": "string",
+                    "description": "Name of the specific item to order (from search results)"
+                },
+                "quantity": {
+                    "type": "integer",
+                    "description": "Number of items to order (default: 1)",
+                    "minimum": 1,
+                    "maximum": 10
+                },
+                "item_url": {
+                    "type": "string",
+                    "description": "Direct URL to the item (if available from search results)"
+                },
+                "delivery_address": {
+                    "type": "string",
+                    "description": "Delivery address (default: Austin, TX)"
+                }
+            },
+            "required": ["restaurant_name", "item_name"]
+        }
+    },
+    {
+        "name": "place_multiple_items_order",
+        "description": "Place an order for multiple items from the same restaurant",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "restaurant_name": {
+                    "type": "string",
+                    "description": "Name of the restaurant"
+                },
+                "items": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "name": {"type": "string", "description": "Item name"},
+                            "quantity": {"type": "integer", "minimum": 1, "description": "Quantity"},
+                            "item_url": {"type": "string", "description": "Direct item URL (optional)"}
+                        },
+                        "required": ["name", "quantity"]
+                    },
+                    "description": "List of items to order from the restaurant"
+                },
+                "delivery_address": {
+                    "type": "string",
+                    "description": "Delivery address (default: Austin, TX)"
+                }
+            },
+            "required": ["restaurant_name", "items"]
+        }
+    },
+    {
+        "name": "check_order_status",
+        "description": "Check the status of an existing order on Uber Eats",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "order_id": {
+                    "type": "string",
+                    "description": "Order ID to check"
+                }
+            },
+            "required": ["order_id"]
+        }
+    },
+    {
+        "name": "create_batch_orders",
+        "description": "Create multiple simultaneous orders from different restaurants on Uber Eats. Use this when the user wants to order from multiple restaurants at once.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "restaurant_queries": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of restaurant search queries (e.g., ['tacos', 'pizza', 'burgers'])"
+                },
+                "items_per_restaurant": {
+                    "type": "array",
+                    "items": {
+                        "type": "array",
+                        "items": {"type": "string"}
+                    },
+                    "description": "List of items to order from each restaurant (e.g., [['beef tacos'], ['pepperoni pizza'], ['cheeseburger']])"
+                },
+                "location": {
+                    "type": "string",
+                    "description": "Delivery location (e.g., 'Austin, TX')"
+                }
+            },
+            "required": ["restaurant_queries", "items_per_restaurant", "location"]
+        }
+    }
+]
+
+
 class ClaudeClient:
     """Client for interacting with Anthropic Claude API"""
     
     def __init__(self):
-        self.client = AsyncAnthropic(api_key=settings.anthropic_api_key)
+        self.client = AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            http_client=anthropic.DefaultAsyncHttpxClient(http2=HTTP2_AVAILABLE, limits=CLAUDE_CONNECTION_LIMITS)
+        )
         self.model = "claude-3-5-sonnet-20241022"
         
         # System prompt for taco ordering
@@ -44,12 +276,21 @@ User: "Check my order status"
 You: "Sure thing! What's your order number?"
 
 Keep it friendly and conversational but concise!"""
+        
+        # Tools + system prompt are identical on every call, so mark them as a cacheable prefix
+        self.system_blocks = [
+            {"type": "text", "text": self.system_prompt, "cache_control": {"type": "ephemeral"}}
+        ]
     
     async def process_voice_command(
         self, 
-        request: ClaudeRequest
+        request: ClaudeRequest,
+        on_text: Optional[Callable[[str], Awaitable[None]]] = None
     ) -> ClaudeResponse:
-        """Process a voice command and generate response with potential function calls"""
+        """Process a voice command and generate response with potential function calls
+        
+        Text deltas are passed to on_text as they stream in, before the full response is ready.
+        """
         
         try:
             # Prepare messages for Claude
@@ -60,237 +301,25 @@ Keep it friendly and conversational but concise!"""
                 }
             ]
             
-            # Add context if available
+            # Add per-session context after the cached prefix so it doesn't invalidate it
+            system = self.system_blocks
             if request.context:
-                context_msg = f"Context: {json.dumps(request.context)}"
-                messages.insert(0, {
-                    "role": "system", 
-                    "content": context_msg
-                })
+                context_msg = f"Context: {orjson.dumps(request.context).decode()}"
+                system = [*self.system_blocks, {"type": "text", "text": context_msg}]
             
-            # Define available tools/functions
-            tools = [
-                {
-                    "name": "search_tacos",
-                    "description": "Search for taco restaurants using fast database lookup",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "Search query (e.g., 'tacos', 'Mexican food', restaurant name, or Austin area)"
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "Maximum number of results (default: 10)",
-                                "minimum": 1,
-                                "maximum": 15
-                            }
-                        },
-                        "required": ["query"]
-                    }
-                },
-                {
-                    "name": "get_restaurant_details",
-                    "description": "Get detailed information about a specific taco restaurant including hours, reviews, and best items",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "restaurant_name": {
-                                "type": "string",
-                                "description": "Name of the restaurant to get details for"
-                            }
-                        },
-                        "required": ["restaurant_name"]
-                    }
-                },
-                {
-                    "name": "get_top_rated_tacos",
-                    "description": "Get the top-rated taco restaurants in Austin with high ratings and reviews",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "limit": {
-                                "type": "integer",
-                                "description": "Number of top restaurants to return (default: 5)",
-                                "minimum": 1,
-                                "maximum": 10
-                            }
-                        }
-                    }
-                },
-                {
-                    "name": "search_by_area",
-                    "description": "Search for taco restaurants in a specific Austin area or neighborhood",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "area": {
-                                "type": "string",
-                                "description": "Austin area, neighborhood, or street name (e.g., 'downtown', 'south austin', 'lamar')"
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "Maximum number of results (default: 8)",
-                                "minimum": 1,
-                                "maximum": 15
-                            }
-                        },
-                        "required": ["area"]
-                    }
-                },
-                {
-                    "name": "search_menu_items",
-                    "description": "Search for specific taco types or menu items mentioned in reviews (e.g., 'beef', 'al pastor', 'spicy', 'carnitas')",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "Search term for menu items (e.g., 'beef', 'al pastor', 'spicy', 'carnitas')"
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "Maximum number of results (default: 15)",
-                                "minimum": 1,
-                                "maximum": 20
-                            }
-                        },
-                        "required": ["query"]
-                    }
-                },
-                {
-                    "name": "get_menu",
-                    "description": "Get menu items from a specific restaurant on Uber Eats",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "restaurant_id": {
-                                "type": "string",
-                                "description": "Restaurant identifier"
-                            },
-                            "restaurant_name": {
-                                "type": "string",
-                                "description": "Restaurant name"
-                            }
-                        },
-                        "required": ["restaurant_name"]
-                    }
-                },
-                {
-                    "name": "order_food",
-                    "description": "Place an order for specific food items from a restaurant (use after finding items with search tools)",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "restaurant_name": {
-                                "type": "string",
-                                "description": "Name of the restaurant (from search results)"
-                            },
-                            "item_name": {
-                                "type": "string",
-                                "description": "Name of the specific item to order (from search results)"
-                            },
-                            "quantity": {
-                                "type": "integer",
-                                "description": "Number of items to order (default: 1)",
-                                "minimum": 1,
-                                "maximum": 10
-                            },
-                            "item_url": {
-                                "type": "string",
-                                "description": "Direct URL to the item (if available from search results)"
-                            },
-                            "delivery_address": {
-                                "type": "string",
-                                "description": "Delivery address (default: Austin, TX)"
-                            }
-                        },
-                        "required": ["restaurant_name", "item_name"]
-                    }
-                },
-                {
-                    "name": "place_multiple_items_order",
-                    "description": "Place an order for multiple items from the same restaurant",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "restaurant_name": {
-                                "type": "string",
-                                "description": "Name of the restaurant"
-                            },
-                            "items": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "name": {"type": "string", "description": "Item name"},
-                                        "quantity": {"type": "integer", "minimum": 1, "description": "Quantity"},
-                                        "item_url": {"type": "string", "description": "Direct item URL (optional)"}
-                                    },
-                                    "required": ["name", "quantity"]
-                                },
-                                "description": "List of items to order from the restaurant"
-                            },
-                            "delivery_address": {
-                                "type": "string",
-                                "description": "Delivery address (default: Austin, TX)"
-                            }
-                        },
-                        "required": ["restaurant_name", "items"]
-                    }
-                },
-                {
-                    "name": "check_order_status",
-                    "description": "Check the status of an existing order on Uber Eats",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "order_id": {
-                                "type": "string",
-                                "description": "Order ID to check"
-                            }
-                        },
-                        "required": ["order_id"]
-                    }
-                },
-                {
-                    "name": "create_batch_orders",
-                    "description": "Create multiple simultaneous orders from different restaurants on Uber Eats. Use this when the user wants to order from multiple restaurants at once.",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "restaurant_queries": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                                "description": "List of restaurant search queries (e.g., ['tacos', 'pizza', 'burgers'])"
-                            },
-                            "items_per_restaurant": {
-                                "type": "array",
-                                "items": {
-                                    "type": "array",
-                                    "items": {"type": "string"}
-                                },
-                                "description": "List of items to order from each restaurant (e.g., [['beef tacos'], ['pepperoni pizza'], ['cheeseburger']])"
-                            },
-                            "location": {
-                                "type": "string",
-                                "description": "Delivery location (e.g., 'Austin, TX')"
-                            }
-                        },
-                        "required": ["restaurant_queries", "items_per_restaurant", "location"]
-                    }
-                }
-            ]
             
-            # Call Claude API
-            response = await self.client.messages.create(
+            # Call Claude API, streaming so callers see the first words without waiting for tool calls
+            async with self.client.messages.stream(
                 model=self.model,
-                max_tokens=100,  # Allow for 1-2 sentence responses
-                system=self.system_prompt,
+                max_tokens=SPOKEN_MAX_TOKENS,
+                system=system,
                 messages=messages,
-                tools=tools
-            )
+                tools=TOOLS
+            ) as stream:
+                if on_text:
+                    async for text in stream.text_stream:
+                        await on_text(text)
+                response = await stream.get_final_message()
             
             # Extract response text and function calls
             response_text = ""
@@ -333,8 +362,8 @@ Keep it friendly and conversational but concise!"""
             
             async with self.client.messages.stream(
                 model=self.model,
-                max_tokens=1000,
-                system=self.system_prompt,
+                max_tokens=SPOKEN_MAX_TOKENS,
+                system=self.system_blocks,
                 messages=messages
             ) as stream:
                 async for text in stream.text_stream:
@@ -343,6 +372,10 @@ Keep it friendly and conversational but concise!"""
         except Exception as e:
             yield f"I'm sorry, I encountered an error: {str(e)}"
     
+    async def close(self):
+        """Close the pooled API connections"""
+        await self.client.close()
+    
     def extract_order_intent(self, text: str) -> Dict[str, Any]:
         """Extract order intent from voice command using simple parsing"""
         
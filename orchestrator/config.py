@@ -19,6 +19,7 @@ class Settings(BaseSettings):
     dashboard_port: int = Field(3000, env="DASHBOARD_PORT")
     tts_port: int = Field(5002, env="TTS_PORT")
     uber_mcp_port: int = Field(7001, env="UBER_MCP_PORT")
+    whisper_server_port: int = Field(8178, env="WHISPER_SERVER_PORT")
     
     # Food Service Credentials
     uber_eats_email: str = Field(..., env="UBER_EATS_EMAIL")
@@ -28,6 +29,8 @@ class Settings(BaseSettings):
     whisper_model: str = Field("tiny", env="WHISPER_MODEL")
     tts_voice: str = Field("en-US-rf1", env="TTS_VOICE")
     wake_word_enabled: bool = Field(False, env="WAKE_WORD_ENABLED")
+    stt_max_concurrency: int = Field(1, env="STT_MAX_CONCURRENCY")
+    silero_vad_model_path: str = Field("models/silero_vad.jit", env="SILERO_VAD_MODEL_PATH")
     
     # Local Configuration
     local_db_path: str = Field("./database/orders.db", env="LOCAL_DB_PATH")
@@ -175,7 +175,7 @@ class MCPResponse(BaseModel):
 
 class DashboardUpdate(BaseModel):
     """Real-time update for dashboard"""
-    type: str  # "order_update", "voice_activity", "system_status"
+    type: str  # "order_update", "voice_activity", "claude_partial", "system_status"
     data: Dict[str, Any]
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     session_id: Optional[str] = None
@@ -3,6 +3,7 @@ Real MCP client that communicates with the Uber Eats MCP server via stdio JSON-R
 """
 
 import asyncio
+import itertools
 import json
 import subprocess
 import sys
@@ -16,7 +17,7 @@ from .models import MCPResponse, Platform
 class RealUberEatsMCPClient:
     def __init__(self):
         self.process = None
-        self.request_id = 1
+        self._next_id = itertools.count(1).__next__  # JSON-RPC request ids
         self.active_searches = {}  # Track ongoing searches
         
     async def start_mcp_server(self):
@@ -120,11 +121,10 @@ class RealUberEatsMCPClient:
         # Create JSON-RPC request for FastMCP
         request = {
             "jsonrpc": "2.0",
-            "id": self.request_id,
+            "id": self._next_id(),
             "method": method,
             "params": params
         }
-        self.request_id += 1
         
         try:
             # Send request
@@ -191,7 +191,7 @@ class RealUberEatsMCPClient:
                 # Extract request ID from the result if available
                 if "resource://search_results/" in result_text:
                     # Store this search for later retrieval
-                    search_id = f"search_{self.request_id}_{session_id}"
+                    search_id = f"search_{response.get('id')}_{session_id}"
                     self.active_searches[search_id] = {
                         "search_term": search_term,
                         "started_at": datetime.utcnow(),
@@ -4,17 +4,32 @@ Provides lightning-fast taco restaurant searches using SQLite database
 """
 
 import asyncio
-import json
+import importlib.util
+import itertools
+import logging
 import subprocess
 import sys
 import os
+import signal
+import time
 import uuid
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
 from enum import Enum
 
+import orjson
+from cachetools import TTLCache
+
 from .models import MCPResponse, Platform
 
+logger = logging.getLogger(__name__)
+
+TACO_SEARCH_SERVER_DIR = "submodules/taco-search-mcp-server"
+
+
+def normalize_query(text: str) -> str:
+    """Canonical form of a spoken search term, so rephrasings like 'Tacos.' and 'tacos' share a cache entry"""
+    return " ".join(text.lower().split()).strip(" .,!?")
+
 
 class CircuitBreakerState(Enum):
     CLOSED = "closed"      # Normal operation
@@ -25,12 +40,15 @@ class CircuitBreakerState(Enum):
 class CircuitBreaker:
     """Circuit breaker to prevent cascade failures"""
     
-    def __init__(self, failure_threshold: int = 3, recovery_timeout: int = 30):
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: int = 30, success_threshold: int = 2):
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
+        self.success_threshold = success_threshold  # Consecutive probe successes needed to close
         self.failure_count = 0
+        self.success_count = 0
         self.last_failure_time = None
         self.state = CircuitBreakerState.CLOSED
+        self._probe_started_at = None  # Set while a half-open probe is in flight
     
     def can_execute(self) -> bool:
         """Check if we can execute the operation"""
@@ -39,23 +57,42 @@ class CircuitBreaker:
         elif self.state == CircuitBreakerState.OPEN:
             # Check if we should try again
             if (self.last_failure_time and 
-                datetime.utcnow().timestamp() - self.last_failure_time > self.recovery_timeout):
+                time.monotonic() - self.last_failure_time > self.recovery_timeout):
                 self.state = CircuitBreakerState.HALF_OPEN
-                return True
+                self.success_count = 0
+                return self._start_probe()
             return False
         elif self.state == CircuitBreakerState.HALF_OPEN:
-            return True
+            # Only one probe at a time while testing recovery, so concurrent callers
+            # don't stampede the recovering server. A probe that never reported back
+            # is abandoned after recovery_timeout.
+            if (self._probe_started_at is not None and
+                time.monotonic() - self._probe_started_at <= self.recovery_timeout):
+                return False
+            return self._start_probe()
         return False
     
+    def _start_probe(self) -> bool:
+        """Mark a half-open probe as in flight"""
+        self._probe_started_at = time.monotonic()
+        return True
+    
     def record_success(self):
         """Record a successful operation"""
+        if self.state == CircuitBreakerState.HALF_OPEN:
+            self._probe_started_at = None
+            self.success_count += 1
+            if self.success_count < self.success_threshold:
+                return
         self.failure_count = 0
+        self.success_count = 0
         self.state = CircuitBreakerState.CLOSED
     
     def record_failure(self):
         """Record a failed operation"""
         self.failure_count += 1
-        self.last_failure_time = datetime.utcnow().timestamp()
+        self.last_failure_time = time.monotonic()
+        self._probe_started_at = None
         
         if self.failure_count >= self.failure_threshold:
             self.state = CircuitBreakerState.OPEN
@@ -63,50 +100,72 @@ class CircuitBreaker:
             self.state = CircuitBreakerState.OPEN
 
 
-class TacoSearchMCPClient:
-    def __init__(self):
+class _MCPWorker:
+    """One taco search MCP server subprocess with its own pipe, pending requests and reader task"""
+    
+    def __init__(self, name: str, next_id, spawn_env: Dict[str, str]):
+        self.name = name
+        self._next_id = next_id  # Shared JSON-RPC id source, so ids are unique across the pool
+        self._spawn_env = spawn_env
         self.process = None
-        self.request_id = 1
         self.pending_requests = {}  # Maps request_id to Future
         self.response_processor_task = None
-        self._process_lock = asyncio.Lock()
-        self._is_initializing = False
+        self._send_queue = None  # Encoded request lines waiting for the writer task
+        self._writer_task = None
         self._initialization_lock = asyncio.Lock()
-        self.circuit_breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+        self._init_done = asyncio.Event()  # Cleared while a (re)start is in progress
+        self._init_done.set()
+        self._ready = asyncio.Event()  # Set once the MCP handshake has completed
         
+    def _process_alive(self) -> bool:
+        """True while the server process is running and its stdout is still being read"""
+        # The response processor stops at EOF, which can be before the exited process is reaped
+        return (self.process is not None and self.process.returncode is None and
+                self.response_processor_task is not None and not self.response_processor_task.done())
+    
     async def start_mcp_server(self):
         """Start the fast taco search MCP server"""
-        if self.process is None or self.process.returncode is not None:
+        if not self._process_alive():
             # Close any existing process first
             if self.process is not None:
                 await self.close()
             
-            # Set up environment
-            env = os.environ.copy()
-            env['PYTHONPATH'] = os.path.join(os.getcwd(), 'venv/lib/python3.13/site-packages')
-            
             # No API key needed for simplified taco search server
-            print("🚀 Starting simplified taco search MCP server (no API key required)")
+            print(f"🚀 Starting simplified taco search MCP server {self.name} (no API key required)")
+            
+            # Only capture server stderr when debugging (MCP_DEBUG=1); otherwise let the
+            # kernel discard it instead of running a reader task for every line
+            debug_stderr = bool(os.environ.get("MCP_DEBUG"))
             
             # Start the taco search MCP server as a subprocess
             self.process = await asyncio.create_subprocess_exec(
                 sys.executable, "server.py",
-                cwd="submodules/taco-search-mcp-server",
+                cwd=TACO_SEARCH_SERVER_DIR,
                 stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=env
+                stderr=asyncio.subprocess.PIPE if debug_stderr else asyncio.subprocess.DEVNULL,
+                env=self._spawn_env,
+                start_new_session=True  # Own process group, so close() can stop any children too
             )
             
-            # Start a task to monitor stderr for debugging
-            asyncio.create_task(self._monitor_stderr())
+            if debug_stderr:
+                # Start a task to monitor stderr for debugging
+                asyncio.create_task(self._monitor_stderr())
+            
+            print(f"🚀 Fast Taco Search MCP server {self.name} started")
+            
+            # Start the response processor before the handshake; no fixed startup sleep -
+            # the initialize request simply waits until the server answers it
+            if self.response_processor_task is None or self.response_processor_task.done():
+                self.response_processor_task = asyncio.create_task(self._process_responses())
             
-            # Wait a moment for the server to initialize
-            await asyncio.sleep(1)
-            print("🚀 Fast Taco Search MCP server started")
+            # Fresh queue per process, so nothing queued for a dead server reaches the new one
+            self._send_queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._write_requests(self.process, self._send_queue))
             
             # Initialize the MCP connection
             await self._initialize_mcp_connection()
+            self._ready.set()
     
     async def _monitor_stderr(self):
         """Monitor stderr output from the MCP server for debugging"""
@@ -125,15 +184,12 @@ class TacoSearchMCPClient:
     async def _initialize_mcp_connection(self):
         """Initialize the MCP connection with proper handshake"""
         try:
-            # Start response processor FIRST
-            if self.response_processor_task is None or self.response_processor_task.done():
-                self.response_processor_task = asyncio.create_task(self._process_responses())
-            
             # Send initialize request directly without using send_mcp_request
             # to avoid circular dependency during initialization
+            init_id = self._next_id()
             init_request = {
                 "jsonrpc": "2.0",
-                "id": self.request_id,
+                "id": init_id,
                 "method": "initialize",
                 "params": {
                     "protocolVersion": "2024-11-05",
@@ -149,18 +205,18 @@ class TacoSearchMCPClient:
             
             # Create future for this request
             future = asyncio.Future()
-            self.pending_requests[self.request_id] = future
-            self.request_id += 1
+            self.pending_requests[init_id] = future
             
             # Send the request
-            request_json = json.dumps(init_request) + "\n"
             print(f"🔵 Sending MCP initialize request")
-            self.process.stdin.write(request_json.encode())
-            await self.process.stdin.drain()
+            self._send_queue.put_nowait(self._encode_message(init_request))
             
             # Wait for response
             try:
-                init_response = await asyncio.wait_for(future, timeout=10.0)
+                async with asyncio.timeout(10.0):
+                    init_response = await future
+                if "error" in init_response:
+                    raise Exception(init_response["error"])
                 print(f"✅ Taco Search Initialize response: {init_response}")
                 
                 # Send initialized notification
@@ -175,6 +231,12 @@ class TacoSearchMCPClient:
             print(f"❌ Error initializing taco search MCP connection: {e}")
             raise
     
+    @staticmethod
+    def _encode_message(message: Dict[str, Any]) -> bytes:
+        """Serialize a JSON-RPC message as a newline-terminated line of bytes"""
+        # orjson produces bytes directly, skipping the str + encode() round trip
+        return orjson.dumps(message) + b"\n"
+    
     async def send_mcp_notification(self, method: str, params: Dict[str, Any]):
         """Send a notification (no response expected)"""
         notification = {
@@ -183,94 +245,120 @@ class TacoSearchMCPClient:
             "params": params
         }
         
-        notification_json = json.dumps(notification) + "\n"
-        self.process.stdin.write(notification_json.encode())
-        await self.process.stdin.drain()
+        self._send_queue.put_nowait(self._encode_message(notification))
+    
+    async def _write_requests(self, process, queue: asyncio.Queue):
+        """Write queued messages to the server, coalescing everything queued during a drain into one write"""
+        try:
+            while True:
+                chunks = [await queue.get()]
+                while not queue.empty():
+                    chunks.append(queue.get_nowait())
+                process.stdin.write(b"".join(chunks))
+                await process.stdin.drain()
+        except Exception as e:
+            # The response processor sees the EOF and fails any pending requests
+            logger.error("❌ Error writing to MCP server: %s", e)
     
     async def _ensure_process_running(self):
         """Ensure the MCP server process is running and initialized"""
+        if not self._init_done.is_set():
+            # Wait for ongoing initialization
+            await self._init_done.wait()
+            return
+        
         async with self._initialization_lock:
-            if self._is_initializing:
-                # Wait for ongoing initialization
-                while self._is_initializing:
-                    await asyncio.sleep(0.1)
-                return
-            
-            if self.process is None or self.process.returncode is not None:
-                self._is_initializing = True
+            if not self._process_alive():
+                self._init_done.clear()
                 try:
                     await self.start_mcp_server()
-                    # Start response processor if not already running
-                    if self.response_processor_task is None or self.response_processor_task.done():
-                        self.response_processor_task = asyncio.create_task(self._process_responses())
                 finally:
-                    self._is_initializing = False
+                    self._init_done.set()
 
     async def _process_responses(self):
         """Process responses from the MCP server in the background"""
+        buffer = bytearray()
         try:
             while self.process and self.process.returncode is None:
                 try:
-                    response_line = await asyncio.wait_for(
-                        self.process.stdout.readline(), 
-                        timeout=1.0  # Short timeout to check process status regularly
-                    )
+                    # Read whatever the pipe has (up to 64 KiB) and split lines ourselves,
+                    # instead of one readline + timeout per message
+                    chunk = await self.process.stdout.read(65536)
+                    if not chunk:
+                        # EOF - the server process has exited
+                        break
                     
-                    if response_line:
-                        response_text = response_line.decode().strip()
-                        
-                        # Skip telemetry and other non-JSON lines
-                        if (response_text.startswith("INFO") or 
-                            response_text.startswith("WARNING") or 
-                            response_text.startswith("ERROR") or
-                            not response_text):
-                            continue
-                        
-                        try:
-                            response = json.loads(response_text)
-                            
-                            # Handle response with ID (request response)
-                            if "id" in response:
-                                request_id = response["id"]
-                                if request_id in self.pending_requests:
-                                    future = self.pending_requests.pop(request_id)
-                                    if not future.done():
-                                        future.set_result(response)
-                                else:
-                                    print(f"⚠️  Received response for unknown request ID: {request_id}")
-                            else:
-                                # Handle notification or error without ID
-                                print(f"📢 MCP Notification: {response}")
-                                
-                        except json.JSONDecodeError:
-                            print(f"🔴 Non-JSON line from MCP server: {response_text}")
-                            continue
+                    buffer += chunk
+                    while (newline := buffer.find(b"\n")) != -1:
+                        response_line = bytes(buffer[:newline])
+                        del buffer[:newline + 1]
+                        self._handle_response_line(response_line)
                     
-                except asyncio.TimeoutError:
-                    # Timeout is expected, just continue to check process status
-                    continue
                 except Exception as e:
-                    print(f"Error processing MCP response: {e}")
+                    logger.error("Error processing MCP response: %s", e)
                     break
                     
         except Exception as e:
-            print(f"Response processor error: {e}")
+            logger.error("Response processor error: %s", e)
         finally:
-            # Cancel any pending requests
-            for request_id, future in self.pending_requests.items():
-                if not future.done():
-                    future.set_exception(Exception("MCP server connection lost"))
-            self.pending_requests.clear()
+            self._ready.clear()
+            # Resolve any pending requests with an error response, so waiters see the
+            # same {"error": ...} shape as a timeout and no exception goes unretrieved
+            pending, self.pending_requests = self.pending_requests, {}
+            for future in pending.values():
+                self._resolve(future, {"error": "MCP server connection lost"})
 
-    async def send_mcp_request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    def _handle_response_line(self, response_line: bytes):
+        """Parse one line of server stdout and dispatch it"""
+        # Skip telemetry and other non-JSON lines (byte compare, no decode needed)
+        if not response_line or response_line[:4] in (b"INFO", b"WARN", b"ERRO"):
+            return
+        
+        try:
+            # orjson parses the raw bytes and tolerates the trailing \r / whitespace
+            response = orjson.loads(response_line)
+        except orjson.JSONDecodeError:
+            response_text = response_line.decode(errors="replace").strip()
+            if response_text:
+                logger.warning("🔴 Non-JSON line from MCP server: %s", response_text)
+            return
+        
+        # A JSON-RPC batch reply is an array of responses
+        if isinstance(response, list):
+            for item in response:
+                self._dispatch_response(item)
+        else:
+            self._dispatch_response(response)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, response: Dict[str, Any]):
+        """Hand a response to a waiting request (no-op if the waiter gave up)"""
+        if not future.done():
+            future.set_result(response)
+
+    def _dispatch_response(self, response: Dict[str, Any]):
+        """Resolve the pending future for a single JSON-RPC response"""
+        # Handle response with ID (request response)
+        if "id" in response:
+            request_id = response["id"]
+            future = self.pending_requests.pop(request_id, None)
+            if future is not None:
+                self._resolve(future, response)
+            else:
+                logger.warning("⚠️  Received response for unknown request ID: %s", request_id)
+        else:
+            # Handle notification or error without ID
+            logger.debug("📢 MCP Notification: %s", response)
+
+    async def send_mcp_request(self, method: str, params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
         """Send JSON-RPC request to MCP server with improved concurrency handling"""
         
-        # Ensure process is running
-        await self._ensure_process_running()
+        # Ensure process is running (fast path once warm-up has completed)
+        if not self._ready.is_set():
+            await self._ensure_process_running()
         
         # Create unique request ID
-        request_id = self.request_id
-        self.request_id += 1
+        request_id = self._next_id()
         
         # Create future for this request
         future = asyncio.Future()
@@ -285,37 +373,237 @@ class TacoSearchMCPClient:
         }
         
         try:
-            # Send request with process lock
-            async with self._process_lock:
-                if self.process is None or self.process.returncode is not None:
-                    raise Exception("MCP server process not available")
-                
-                request_json = json.dumps(request) + "\n"
-                print(f"🔵 Sending MCP request ID {request_id}: {method}")
-                self.process.stdin.write(request_json.encode())
-                await self.process.stdin.drain()
+            if not self._process_alive():
+                raise Exception("MCP server process not available")
+            
+            # Queue the request for the writer task, which batches concurrent sends
+            logger.debug("🔵 Sending MCP request ID %d: %s", request_id, method)
+            self._send_queue.put_nowait(self._encode_message(request))
             
             # Wait for response with timeout
-            timeout = 15.0 if method == "tools/call" and params.get("name") == "intelligent_search" else 8.0
-            print(f"⏱️  Waiting for response ID {request_id} with timeout: {timeout}s")
+            logger.debug("⏱️  Waiting for response ID %d with timeout: %ss", request_id, timeout)
             
             try:
-                response = await asyncio.wait_for(future, timeout=timeout)
-                print(f"✅ Received response for request ID {request_id}")
+                async with asyncio.timeout(timeout):
+                    response = await future
+                logger.debug("✅ Received response for request ID %d", request_id)
                 return response
                 
             except asyncio.TimeoutError:
-                print(f"❌ Timeout waiting for response to request ID {request_id}")
+                logger.warning("❌ Timeout waiting for response to request ID %d", request_id)
                 # Clean up pending request
                 self.pending_requests.pop(request_id, None)
                 return {"error": f"Timeout waiting for MCP server response (request {request_id})"}
                 
         except Exception as e:
-            print(f"❌ Error sending MCP request ID {request_id}: {str(e)}")
+            logger.error("❌ Error sending MCP request ID %d: %s", request_id, e)
             # Clean up pending request
             self.pending_requests.pop(request_id, None)
             return {"error": f"MCP communication error: {str(e)}"}
     
+    async def send_mcp_batch(self, calls: List[Tuple[str, Dict[str, Any]]], timeout: float) -> List[Dict[str, Any]]:
+        """Send several JSON-RPC requests in one pipe write and return their responses in order.
+        
+        The stdio transport reads one JSON message per line, so the batch is written as
+        newline-delimited requests in a single write/drain rather than as a JSON array.
+        """
+        
+        if not calls:
+            return []
+        
+        # Ensure process is running (fast path once warm-up has completed)
+        if not self._ready.is_set():
+            await self._ensure_process_running()
+        
+        request_ids = [self._next_id() for _ in calls]
+        futures = []
+        lines = []
+        for request_id, (method, params) in zip(request_ids, calls):
+            future = asyncio.Future()
+            self.pending_requests[request_id] = future
+            futures.append(future)
+            lines.append(self._encode_message({
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": method,
+                "params": params
+            }))
+        
+        try:
+            if not self._process_alive():
+                raise Exception("MCP server process not available")
+            
+            logger.debug("🔵 Sending MCP batch of %d requests (IDs %d-%d)", len(calls), request_ids[0], request_ids[-1])
+            self._send_queue.put_nowait(b"".join(lines))
+        except Exception as e:
+            logger.error("❌ Error sending MCP batch: %s", e)
+            for request_id in request_ids:
+                self.pending_requests.pop(request_id, None)
+            return [{"error": f"MCP communication error: {str(e)}"} for _ in calls]
+        
+        # Wait for every response, bounded by the slowest request's timeout
+        await asyncio.wait(futures, timeout=timeout)
+        
+        responses = []
+        for request_id, future in zip(request_ids, futures):
+            if future.done():
+                responses.append(future.result())
+            else:
+                self.pending_requests.pop(request_id, None)
+                future.cancel()
+                responses.append({"error": f"Timeout waiting for MCP server response (request {request_id})"})
+        
+        return responses
+    
+    async def close(self):
+        """Close the taco search MCP server process"""
+        self._ready.clear()
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            self._writer_task = None
+        if self.process:
+            try:
+                self._signal_process_group(signal.SIGTERM)
+                async with asyncio.timeout(5.0):
+                    await self.process.wait()
+            except asyncio.TimeoutError:
+                self._signal_process_group(signal.SIGKILL)
+                await self.process.wait()
+            finally:
+                self.process = None
+                print(f"🛑 Fast Taco Search MCP server {self.name} stopped")
+    
+    def _signal_process_group(self, sig: int):
+        """Send a signal to the server's whole process group (just the process where groups aren't supported)"""
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(self.process.pid, sig)
+            else:
+                self.process.send_signal(sig)
+        except ProcessLookupError:
+            # Already exited
+            pass
+
+
+class TacoSearchMCPClient:
+    def __init__(self, pool_size: Optional[int] = None):
+        # Environment for the server subprocesses, built once rather than on every (re)start
+        spawn_env = {
+            **os.environ,
+            'PYTHONPATH': os.path.join(
+                sys.prefix, 'lib',
+                f'python{sys.version_info.major}.{sys.version_info.minor}', 'site-packages'
+            ),
+        }
+        # Small pool of warm MCP subprocesses so a slow call doesn't hold up the others
+        pool_size = pool_size or int(os.environ.get("TACO_SEARCH_POOL_SIZE", "2"))
+        ids = itertools.count(1)  # JSON-RPC request ids
+        self._pool = [_MCPWorker(f"#{index + 1}", ids.__next__, spawn_env) for index in range(pool_size)]
+        self.circuit_breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+        self._local_server = None  # In-process FastMCP server, loaded on first use
+        self._local_module = None  # Its server module, for database health probes
+        self._local_server_loaded = False
+        # Read-only tool results keyed by (tool name, arguments); cleared whenever a call fails
+        self._tool_cache = TTLCache(maxsize=512, ttl=60)
+        self._inflight_tools = {}  # Maps the same key to the task fetching it, so duplicate calls share one request
+    
+    async def warmup(self):
+        """Start the MCP servers ahead of the first request (called from app startup)"""
+        if self._local_backend() is not None:
+            return
+        results = await asyncio.gather(
+            *(worker._ensure_process_running() for worker in self._pool), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                # Not fatal - the first real request will retry the start
+                print(f"⚠️  Taco search MCP warm-up failed: {result}")
+    
+    def _local_backend(self):
+        """Return the taco search server loaded in-process, or None to use the MCP subprocess"""
+        if not self._local_server_loaded:
+            self._local_server_loaded = True
+            # TACO_SEARCH_SUBPROCESS=1 keeps the server in its own process for isolation
+            if not os.environ.get("TACO_SEARCH_SUBPROCESS"):
+                try:
+                    spec = importlib.util.spec_from_file_location(
+                        "taco_search_mcp_server", os.path.join(TACO_SEARCH_SERVER_DIR, "server.py")
+                    )
+                    module = importlib.util.module_from_spec(spec)
+                    # The server configures the root logger for its own process (level and handlers);
+                    # put the orchestrator's back so its warnings keep showing
+                    root_logger = logging.getLogger()
+                    saved_level, saved_handlers = root_logger.level, root_logger.handlers[:]
+                    try:
+                        spec.loader.exec_module(module)
+                    finally:
+                        root_logger.setLevel(saved_level)
+                        root_logger.handlers[:] = saved_handlers
+                    self._local_module = module
+                    self._local_server = module.mcp
+                    print("🚀 Fast Taco Search running in-process")
+                except Exception as e:
+                    print(f"⚠️  In-process taco search unavailable, using MCP subprocess: {e}")
+        return self._local_server
+    
+    async def _send_local_request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle a request with the in-process server, returning the same envelope as the subprocess"""
+        if method == "ping":
+            # No pipe to probe in-process, so check that the database still answers instead
+            try:
+                async with asyncio.timeout(self._request_timeout(method, params)):
+                    await self._local_module.run_db(self._local_module.ping_database)
+            except asyncio.TimeoutError:
+                return {"error": "Timeout waiting for taco search database"}
+            except Exception as e:
+                return {"error": f"Taco search database error: {str(e)}"}
+            return {"result": {}}
+        
+        try:
+            async with asyncio.timeout(self._request_timeout(method, params)):
+                result = await self._local_server.call_tool(params["name"], params.get("arguments", {}))
+        except asyncio.TimeoutError:
+            return {"error": f"Timeout waiting for taco search tool {params['name']}"}
+        except Exception as e:
+            return {"error": f"Taco search tool error: {str(e)}"}
+        
+        content, structured = result if isinstance(result, tuple) else (result, None)
+        response = {"content": [block.model_dump(mode="json", exclude_none=True) for block in content]}
+        if structured is not None:
+            response["structuredContent"] = structured
+        response["isError"] = False
+        return {"result": response}
+    
+    @staticmethod
+    def _request_timeout(method: str, params: Dict[str, Any]) -> float:
+        """Response timeout for a request, in seconds"""
+        return 15.0 if method == "tools/call" and params.get("name") == "intelligent_search" else 8.0
+
+    def _pick_worker(self) -> _MCPWorker:
+        """Pick the pool worker with the fewest requests in flight"""
+        return min(self._pool, key=lambda worker: len(worker.pending_requests))
+
+    async def send_mcp_request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Send JSON-RPC request to the least busy MCP server in the pool"""
+        
+        # Tool calls and pings skip the pipe and JSON-RPC framing when the server runs in-process
+        if method in ("tools/call", "ping") and self._local_backend() is not None:
+            return await self._send_local_request(method, params)
+        
+        return await self._pick_worker().send_mcp_request(method, params, self._request_timeout(method, params))
+    
+    async def send_mcp_batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Send several JSON-RPC requests in one pipe write and return their responses in order"""
+        
+        if not calls:
+            return []
+        
+        if self._local_backend() is not None:
+            return await asyncio.gather(*(self.send_mcp_request(method, params) for method, params in calls))
+        
+        timeout = max(self._request_timeout(method, params) for method, params in calls)
+        return await self._pick_worker().send_mcp_batch(calls, timeout)
+    
     def _create_fallback_response(self, query: str, session_id: str = "") -> MCPResponse:
         """Create a fallback response when MCP server is unavailable"""
         fallback_message = f"""🔄 Taco search service is temporarily unavailable. Here are some popular Austin taco spots to try:
@@ -341,13 +629,27 @@ Status: Using fallback recommendations (MCP server unavailable)"""
             session_id=session_id
         )
 
+    def _create_unavailable_response(self, session_id: str = "") -> MCPResponse:
+        """Create an error response when MCP server is unavailable"""
+        return MCPResponse(
+            success=False,
+            error="Taco search service unavailable",
+            platform=Platform.UBER_EATS,
+            session_id=session_id
+        )
+
+    def _record_failure(self):
+        """Record a failed call with the circuit breaker and drop cached tool results"""
+        self.circuit_breaker.record_failure()
+        self._tool_cache.clear()
+
     async def _execute_with_circuit_breaker(self, operation_name: str, operation_func, fallback_func, *args, **kwargs):
         """Execute an operation with circuit breaker protection"""
         
         # Check circuit breaker state
         if not self.circuit_breaker.can_execute():
-            print(f"🔴 Circuit breaker OPEN for {operation_name}, using fallback")
-            return await fallback_func(*args, **kwargs)
+            logger.warning("🔴 Circuit breaker OPEN for %s, using fallback", operation_name)
+            return await fallback_func()
         
         try:
             # Execute the operation
@@ -359,40 +661,49 @@ Status: Using fallback recommendations (MCP server unavailable)"""
                 return result
             else:
                 # Operation returned an error
-                self.circuit_breaker.record_failure()
-                print(f"⚠️  {operation_name} failed, circuit breaker recorded failure")
-                return await fallback_func(*args, **kwargs)
+                self._record_failure()
+                logger.warning("⚠️  %s failed, circuit breaker recorded failure", operation_name)
+                return await fallback_func()
                 
         except Exception as e:
             # Operation threw an exception
-            self.circuit_breaker.record_failure()
-            print(f"❌ {operation_name} exception, circuit breaker recorded failure: {e}")
-            return await fallback_func(*args, **kwargs)
+            self._record_failure()
+            logger.error("❌ %s exception, circuit breaker recorded failure: %s", operation_name, e)
+            return await fallback_func()
 
-    async def _search_tacos_mcp(self, query: str, limit: int = 10, session_id: str = "") -> MCPResponse:
-        """Internal method to call MCP search_restaurants"""
-        response = await self.send_mcp_request(
-            "tools/call",
-            {
-                "name": "search_restaurants",
-                "arguments": {
-                    "query": query,
-                    "limit": limit
-                }
-            }
-        )
-        
+    async def _call_tool(self, name: str, arguments: Dict[str, Any], session_id: str, status: str,
+                         extra_data: Optional[Dict[str, Any]] = None) -> MCPResponse:
+        """Call an MCP tool and wrap its JSON-RPC response in an MCPResponse"""
+        arguments = {key: normalize_query(value) if isinstance(value, str) else value
+                     for key, value in arguments.items()}
+        cache_key = (name, frozenset(arguments.items()))
+        response = self._tool_cache.get(cache_key)
+        if response is None:
+            # Coalesce identical concurrent calls onto a single in-flight request
+            task = self._inflight_tools.get(cache_key)
+            if task is None:
+                task = asyncio.create_task(self._fetch_tool(name, arguments, cache_key))
+                self._inflight_tools[cache_key] = task
+                task.add_done_callback(lambda _: self._inflight_tools.pop(cache_key, None))
+            # Shielded so one caller being cancelled doesn't cancel the request for the others
+            response = await asyncio.shield(task)
+        return self._tool_response(response, session_id, status, extra_data)
+
+    async def _fetch_tool(self, name: str, arguments: Dict[str, Any], cache_key) -> Dict[str, Any]:
+        """Send a tools/call request and cache a successful response"""
+        response = await self.send_mcp_request("tools/call", {"name": name, "arguments": arguments})
+        if "result" in response:
+            self._tool_cache[cache_key] = response
+        return response
+
+    @staticmethod
+    def _tool_response(response: Dict[str, Any], session_id: str, status: str,
+                       extra_data: Optional[Dict[str, Any]] = None) -> MCPResponse:
+        """Convert a tools/call JSON-RPC response into an MCPResponse"""
         if "result" in response:
-            result_text = response["result"]
-            
             return MCPResponse(
                 success=True,
-                data={
-                    "message": result_text,
-                    "search_term": query,
-                    "status": "search_completed",
-                    "source": "fast_database"
-                },
+                data={"message": response["result"], **(extra_data or {}), "status": status},
                 platform=Platform.UBER_EATS,
                 session_id=session_id
             )
@@ -405,6 +716,13 @@ Status: Using fallback recommendations (MCP server unavailable)"""
                 session_id=session_id
             )
 
+    async def _search_tacos_mcp(self, query: str, limit: int = 10, session_id: str = "") -> MCPResponse:
+        """Internal method to call MCP search_restaurants"""
+        return await self._call_tool(
+            "search_restaurants", {"query": query, "limit": limit}, session_id,
+            "search_completed", {"search_term": query, "source": "fast_database"}
+        )
+
     async def search_tacos(self, query: str, limit: int = 10, session_id: str = "") -> MCPResponse:
         """Search for taco restaurants using fast database lookup with circuit breaker protection"""
         
@@ -418,155 +736,99 @@ Status: Using fallback recommendations (MCP server unavailable)"""
             query, limit, session_id
         )
     
-    async def get_restaurant_details(self, restaurant_name: str, session_id: str = "") -> MCPResponse:
-        """Get detailed information about a specific restaurant"""
+    async def search_many(self, queries: List[str], limit: int = 10, session_id: str = "") -> List[MCPResponse]:
+        """Search for several queries at once using a single batched write to the MCP server"""
+        
+        if not self.circuit_breaker.can_execute():
+            logger.warning("🔴 Circuit breaker OPEN for search_many, using fallback")
+            return [self._create_fallback_response(query, session_id) for query in queries]
+        
+        # Serve cached searches directly and batch only the misses
+        normalized = [normalize_query(query) for query in queries]
+        cache_keys = [("search_restaurants", frozenset({"query": query, "limit": limit}.items())) for query in normalized]
+        responses = [self._tool_cache.get(cache_key) for cache_key in cache_keys]
+        misses = [index for index, response in enumerate(responses) if response is None]
         
         try:
-            response = await self.send_mcp_request(
-                "tools/call",
-                {
-                    "name": "get_restaurant_details",
-                    "arguments": {
-                        "restaurant_name": restaurant_name
-                    }
-                }
+            fetched = await self.send_mcp_batch(
+                [("tools/call", {"name": "search_restaurants", "arguments": {"query": normalized[index], "limit": limit}})
+                 for index in misses]
             )
-            
-            if "result" in response:
-                result_text = response["result"]
-                
-                return MCPResponse(
-                    success=True,
-                    data={
-                        "message": result_text,
-                        "restaurant_name": restaurant_name,
-                        "status": "details_retrieved"
-                    },
-                    platform=Platform.UBER_EATS,
-                    session_id=session_id
-                )
-            else:
-                error_msg = response.get("error", "Unknown error from taco search MCP server")
-                return MCPResponse(
-                    success=False,
-                    error=error_msg,
-                    platform=Platform.UBER_EATS,
-                    session_id=session_id
-                )
-                
         except Exception as e:
-            return MCPResponse(
-                success=False,
-                error=f"Error getting restaurant details: {str(e)}",
-                platform=Platform.UBER_EATS,
-                session_id=session_id
+            self._record_failure()
+            logger.error("❌ search_many exception, circuit breaker recorded failure: %s", e)
+            return [self._create_fallback_response(query, session_id) for query in queries]
+        
+        for index, response in zip(misses, fetched):
+            responses[index] = response
+            if "result" in response:
+                self._tool_cache[cache_keys[index]] = response
+        
+        results = []
+        for query, response in zip(queries, responses):
+            result = self._tool_response(
+                response, session_id, "search_completed", {"search_term": query, "source": "fast_database"}
             )
+            if result.success:
+                self.circuit_breaker.record_success()
+                results.append(result)
+            else:
+                self._record_failure()
+                results.append(self._create_fallback_response(query, session_id))
+        
+        return results
+    
+    async def get_restaurant_details(self, restaurant_name: str, session_id: str = "") -> MCPResponse:
+        """Get detailed information about a specific restaurant"""
+        
+        async def fallback():
+            return self._create_unavailable_response(session_id)
+        
+        return await self._execute_with_circuit_breaker(
+            "get_restaurant_details",
+            self._call_tool,
+            fallback,
+            "get_restaurant_details", {"restaurant_name": restaurant_name}, session_id,
+            "details_retrieved", {"restaurant_name": restaurant_name}
+        )
     
     async def get_top_rated_tacos(self, limit: int = 5, session_id: str = "") -> MCPResponse:
         """Get top-rated taco restaurants"""
         
-        try:
-            response = await self.send_mcp_request(
-                "tools/call",
-                {
-                    "name": "get_top_rated_restaurants",
-                    "arguments": {
-                        "limit": limit
-                    }
-                }
-            )
-            
-            if "result" in response:
-                result_text = response["result"]
-                
-                return MCPResponse(
-                    success=True,
-                    data={
-                        "message": result_text,
-                        "status": "top_rated_retrieved"
-                    },
-                    platform=Platform.UBER_EATS,
-                    session_id=session_id
-                )
-            else:
-                error_msg = response.get("error", "Unknown error from taco search MCP server")
-                return MCPResponse(
-                    success=False,
-                    error=error_msg,
-                    platform=Platform.UBER_EATS,
-                    session_id=session_id
-                )
-                
-        except Exception as e:
-            return MCPResponse(
-                success=False,
-                error=f"Error getting top-rated tacos: {str(e)}",
-                platform=Platform.UBER_EATS,
-                session_id=session_id
-            )
+        async def fallback():
+            return self._create_unavailable_response(session_id)
+        
+        return await self._execute_with_circuit_breaker(
+            "get_top_rated_tacos",
+            self._call_tool,
+            fallback,
+            "get_top_rated_restaurants", {"limit": limit}, session_id, "top_rated_retrieved"
+        )
     
     async def search_by_area(self, area: str, limit: int = 8, session_id: str = "") -> MCPResponse:
         """Search for taco restaurants by area"""
         
-        try:
-            response = await self.send_mcp_request(
-                "tools/call",
-                {
-                    "name": "get_restaurants_by_area",
-                    "arguments": {
-                        "area": area,
-                        "limit": limit
-                    }
-                }
-            )
-            
-            if "result" in response:
-                result_text = response["result"]
-                
-                return MCPResponse(
-                    success=True,
-                    data={
-                        "message": result_text,
-                        "area": area,
-                        "status": "area_search_completed"
-                    },
-                    platform=Platform.UBER_EATS,
-                    session_id=session_id
-                )
-            else:
-                error_msg = response.get("error", "Unknown error from taco search MCP server")
-                return MCPResponse(
-                    success=False,
-                    error=error_msg,
-                    platform=Platform.UBER_EATS,
-                    session_id=session_id
-                )
-                
-        except Exception as e:
-            return MCPResponse(
-                success=False,
-                error=f"Error searching by area: {str(e)}",
-                platform=Platform.UBER_EATS,
-                session_id=session_id
-            )
+        async def fallback():
+            return self._create_unavailable_response(session_id)
+        
+        return await self._execute_with_circuit_breaker(
+            "search_by_area",
+            self._call_tool,
+            fallback,
+            "get_restaurants_by_area", {"area": area, "limit": limit}, session_id,
+            "area_search_completed", {"area": area}
+        )
     
     
     async def health_check(self) -> bool:
         """Check if taco search MCP server is healthy"""
         try:
-            # Use the dedicated health_check tool instead of doing a full search
-            response = await self.send_mcp_request(
-                "tools/call",
-                {
-                    "name": "health_check",
-                    "arguments": {}
-                }
-            )
+            # Use the protocol-level ping rather than a tool call so the probe skips tool
+            # dispatch; in-process it runs a one-row database query instead
+            response = await self.send_mcp_request("ping", {})
             
             if "result" in response:
-                result_text = response["result"]
-                # Check if the health check was successful
-                return "✅" in result_text and "healthy" in result_text.lower()
+                return True
             else:
                 print(f"Taco search health check failed: {response.get('error', 'Unknown error')}")
                 return False
@@ -576,17 +838,8 @@ Status: Using fallback recommendations (MCP server unavailable)"""
             return False
     
     async def close(self):
-        """Close the taco search MCP server process"""
-        if self.process:
-            try:
-                self.process.terminate()
-                await asyncio.wait_for(self.process.wait(), timeout=5.0)
-            except asyncio.TimeoutError:
-                self.process.kill()
-                await self.process.wait()
-            finally:
-                self.process = None
-                print("🛑 Fast Taco Search MCP server stopped")
+        """Close the taco search MCP server processes"""
+        await asyncio.gather(*(worker.close() for worker in self._pool))
 
 
 # Global instance
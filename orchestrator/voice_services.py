@@ -4,20 +4,73 @@ Optimized for Apple Silicon with Core ML Whisper and Metal TTS
 """
 
 import asyncio
+import functools
+import io
 import json
+import struct
 import subprocess
 import tempfile
+import threading
 import wave
-from typing import Optional, AsyncGenerator
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, AsyncGenerator
 from pathlib import Path
 
-import sounddevice as sd
+import httpx
 import numpy as np
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException
 from pydantic import BaseModel
 
 from .config import settings
 
+try:
+    from faster_whisper import WhisperModel as FasterWhisperModel  # Optional int8 CTranslate2 backend
+except ImportError:
+    FasterWhisperModel = None
+
+try:
+    from pywhispercpp.model import Model as WhisperCppModel  # Optional in-process whisper.cpp bindings
+except ImportError:
+    WhisperCppModel = None
+
+try:
+    import torch  # Optional: enables the Silero VAD
+except ImportError:
+    torch = None
+
+try:
+    from silero_vad import load_silero_vad  # Optional: bundles the Silero VAD model (pip install silero-vad)
+except ImportError:
+    load_silero_vad = None
+
+
+def pcm16_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wrap 16-bit mono PCM in a 44-byte WAV header, built in memory"""
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + len(pcm), b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b"data", len(pcm)
+    )
+    return header + pcm
+
+
+def wav_to_samples(wav_data: bytes) -> np.ndarray:
+    """Decode 16-bit mono WAV bytes into float32 samples in [-1, 1)"""
+    with wave.open(io.BytesIO(wav_data), "rb") as wav_file:
+        frames = wav_file.readframes(wav_file.getnframes())
+    return pcm16_to_samples(frames)
+
+
+def pcm16_to_samples(pcm: bytes) -> np.ndarray:
+    """Convert raw 16-bit PCM into float32 samples in [-1, 1)"""
+    return np.frombuffer(pcm, dtype=np.int16).astype(np.float32) * (1 / 32768.0)
+
+
+def samples_to_pcm16(samples: np.ndarray) -> bytes:
+    """Convert float32 samples back into raw 16-bit PCM"""
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+
 
 class STTRequest(BaseModel):
     """Request for speech-to-text conversion"""
@@ -57,54 +110,77 @@ class WhisperSTTService:
     def __init__(self):
         self.model_path = Path("submodules/whisper.cpp")
         self.model_name = settings.whisper_model
+        self.model_file = self.model_path / f"models/ggml-{self.model_name}.bin"
         self.executable = self.model_path / "main"
+        self.server_executable = self.model_path / "server"
+        
+        # In-process models skip the subprocess/HTTP hop entirely when installed; faster-whisper
+        # with int8 weights is preferred, then the whisper.cpp bindings
+        self._model = None
+        self._model_is_faster_whisper = False
+        max_concurrency = 1
+        if FasterWhisperModel is not None:
+            # CTranslate2 runs num_workers transcriptions in parallel on one model
+            max_concurrency = max(1, settings.stt_max_concurrency)
+            self._model = FasterWhisperModel(
+                self.model_name, device="auto", compute_type="int8", num_workers=max_concurrency
+            )
+            self._model_is_faster_whisper = True
+        elif WhisperCppModel is not None and self.model_file.exists():
+            # A whisper.cpp context runs one inference at a time
+            self._model = WhisperCppModel(
+                str(self.model_file), language="en", print_progress=False, print_realtime=False
+            )
+        
+        # Dedicated threads for blocking inference, capped so requests queue instead of oversubscribing
+        self._inference_pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="stt")
+        self._inference_slots = asyncio.Semaphore(max_concurrency)
         
         # Check if Whisper.cpp is built
-        if not self.executable.exists():
+        if self._model is None and not self.executable.exists():
             raise RuntimeError(
                 "Whisper.cpp not found. Run 'just build-whisper' to build it."
             )
+        
+        # Persistent whisper.cpp server: the model is loaded once instead of on every request
+        self.server_url = f"http://127.0.0.1:{settings.whisper_server_port}"
+        self._server_process = None
+        self._server_lock = asyncio.Lock()
+        self._http = httpx.AsyncClient(timeout=30.0)
     
     async def transcribe_audio(self, audio_data: bytes, session_id: str) -> STTResponse:
-        """Transcribe audio data to text using Core ML Whisper"""
+        """Transcribe WAV audio data to text using Core ML Whisper"""
+        return await self._transcribe(session_id, wav_data=audio_data)
+    
+    async def transcribe_samples(self, samples: np.ndarray, session_id: str) -> STTResponse:
+        """Transcribe 16 kHz mono float32 samples (Whisper's native input) to text"""
+        return await self._transcribe(session_id, samples=samples)
+    
+    async def _transcribe(
+        self,
+        session_id: str,
+        wav_data: Optional[bytes] = None,
+        samples: Optional[np.ndarray] = None
+    ) -> STTResponse:
+        """Run whichever backend is available, converting the audio only if that backend needs it"""
         
         import time
         start_time = time.time()
         
         try:
-            # Save audio data to temporary file
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-                temp_file.write(audio_data)
-                temp_path = temp_file.name
-            
-            # Run Whisper.cpp with Core ML
-            cmd = [
-                str(self.executable),
-                "-m", str(self.model_path / f"models/ggml-{self.model_name}.bin"),
-                "-f", temp_path,
-                "--output-txt",
-                "--no-timestamps",
-                "--language", "en"
-            ]
-            
-            # Execute Whisper
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode != 0:
-                raise RuntimeError(f"Whisper failed: {result.stderr}")
-            
-            # Parse output
-            text = result.stdout.strip()
+            if self._model is not None:
+                if samples is None:
+                    samples = wav_to_samples(wav_data)
+                text = await self._transcribe_in_process(samples)
+            else:
+                if wav_data is None:
+                    wav_data = pcm16_to_wav(samples_to_pcm16(samples), 16000)
+                if self.server_executable.exists():
+                    text = await self._transcribe_with_server(wav_data)
+                else:
+                    text = await self._transcribe_with_cli(wav_data)
             confidence = 0.9  # Whisper doesn't provide confidence, use default
             
-            # Clean up temp file
-            Path(temp_path).unlink(missing_ok=True)
-            
             processing_time = int((time.time() - start_time) * 1000)
             
             return STTResponse(
@@ -115,16 +191,114 @@ class WhisperSTTService:
             )
             
         except Exception as e:
-            # Clean up temp file on error
-            try:
-                Path(temp_path).unlink(missing_ok=True)
-            except:
-                pass
-            
             raise HTTPException(
                 status_code=500,
                 detail=f"STT processing failed: {str(e)}"
             )
+    
+    async def _transcribe_in_process(self, samples: np.ndarray) -> str:
+        """Transcribe float32 samples with the in-process model"""
+        # Inference is blocking native code, so keep it off the event loop
+        async with self._inference_slots:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._inference_pool, self._run_model, samples
+            )
+    
+    def _run_model(self, samples: np.ndarray) -> str:
+        """Blocking inference with the in-process model"""
+        if self._model_is_faster_whisper:
+            # Segments are generated lazily, so they are consumed here, inside the executor
+            segments, _ = self._model.transcribe(samples, language="en", beam_size=1, vad_filter=True)
+        else:
+            segments = self._model.transcribe(samples)
+        return " ".join(segment.text.strip() for segment in segments).strip()
+    
+    async def _ensure_server(self):
+        """Start the whisper.cpp server if it isn't running (restarts it after a crash)"""
+        async with self._server_lock:
+            if self._server_process is not None and self._server_process.returncode is None:
+                return
+            
+            # Reuse a server that is already listening (another instance or started by hand)
+            try:
+                await self._http.get(self.server_url)
+                return
+            except httpx.TransportError:
+                pass
+            
+            print("🎤 Starting persistent whisper.cpp server")
+            self._server_process = await asyncio.create_subprocess_exec(
+                str(self.server_executable),
+                "-m", str(self.model_file),
+                "--host", "127.0.0.1",
+                "--port", str(settings.whisper_server_port),
+                "--language", "en",
+                "--no-timestamps",
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            
+            # Wait for the model to load and the server to accept connections
+            async with asyncio.timeout(30):
+                while True:
+                    if self._server_process.returncode is not None:
+                        raise RuntimeError("Whisper server exited during startup")
+                    try:
+                        await self._http.get(self.server_url)
+                        return
+                    except httpx.TransportError:
+                        await asyncio.sleep(0.1)
+    
+    async def _transcribe_with_server(self, audio_data: bytes) -> str:
+        """Transcribe WAV bytes with the persistent whisper.cpp server"""
+        await self._ensure_server()
+        response = await self._http.post(
+            f"{self.server_url}/inference",
+            files={"file": ("audio.wav", audio_data, "audio/wav")},
+            data={"response_format": "json", "temperature": "0.0"}
+        )
+        response.raise_for_status()
+        return response.json().get("text", "").strip()
+    
+    async def _transcribe_with_cli(self, audio_data: bytes) -> str:
+        """Transcribe WAV bytes with a one-shot whisper.cpp process (older builds without the server)"""
+        # Feed the WAV bytes on stdin ("-f -") instead of round-tripping them through a temp file
+        cmd = [
+            str(self.executable),
+            "-m", str(self.model_file),
+            "-f", "-",
+            "--no-timestamps",
+            "--language", "en"
+        ]
+        
+        # Execute Whisper
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            async with asyncio.timeout(30):
+                stdout, stderr = await process.communicate(audio_data)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise RuntimeError("Whisper timed out")
+        
+        if process.returncode != 0:
+            raise RuntimeError(f"Whisper failed: {stderr.decode(errors='replace')}")
+        
+        return stdout.decode().strip()
+    
+    async def close(self):
+        """Stop the whisper.cpp server and release the HTTP client and inference threads"""
+        if self._server_process is not None and self._server_process.returncode is None:
+            self._server_process.terminate()
+            await self._server_process.wait()
+        self._server_process = None
+        await self._http.aclose()
+        self._inference_pool.shutdown(wait=False)
 
 
 class MetalTTSService:
@@ -159,52 +333,72 @@ class MetalTTSService:
     async def _synthesize_with_say(self, text: str, session_id: str) -> TTSResponse:
         """Use macOS built-in 'say' command for TTS"""
         
-        # Create temporary file for audio output
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-            temp_path = temp_file.name
-        
+        # Take the WAV straight from say's stdout so the audio never touches disk
         try:
-            # Use macOS 'say' command
-            cmd = [
-                "say",
-                "-v", self.voice,
-                "-o", temp_path,
-                "--data-format=LEI16@22050",
-                text
-            ]
-            
-            # Execute TTS
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            if result.returncode != 0:
-                raise RuntimeError(f"TTS failed: {result.stderr}")
-            
-            # Read generated audio
-            with open(temp_path, "rb") as f:
-                audio_data = f.read()
-            
-            # Clean up temp file
-            Path(temp_path).unlink(missing_ok=True)
-            
-            return TTSResponse(
-                audio_data=audio_data,
-                session_id=session_id,
-                format="wav",
-                sample_rate=22050
-            )
-            
-        except Exception as e:
-            # Clean up temp file on error
+            audio_data = self._fix_wav_sizes(await self._run_say(text, "/dev/stdout"))
+        except RuntimeError:
+            audio_data = b""
+        
+        if not audio_data:
+            # Some macOS versions refuse to write WAV to a pipe; go through a temp file instead
+            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
+                temp_path = temp_file.name
             try:
+                await self._run_say(text, temp_path)
+                audio_data = Path(temp_path).read_bytes()
+            finally:
                 Path(temp_path).unlink(missing_ok=True)
-            except:
-                pass
-            raise e
+        
+        return TTSResponse(
+            audio_data=audio_data,
+            session_id=session_id,
+            format="wav",
+            sample_rate=22050
+        )
+    
+    async def _run_say(self, text: str, output_path: str) -> bytes:
+        """Run 'say' writing 16-bit 22.05 kHz WAV to output_path, returning its stdout"""
+        
+        # Use macOS 'say' command
+        cmd = [
+            "say",
+            "-v", self.voice,
+            "-o", output_path,
+            "--file-format=WAVE",
+            "--data-format=LEI16@22050",
+            text
+        ]
+        
+        # Execute TTS
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            async with asyncio.timeout(30):
+                stdout, stderr = await process.communicate()
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise RuntimeError("TTS timed out")
+        
+        if process.returncode != 0:
+            raise RuntimeError(f"TTS failed: {stderr.decode(errors='replace')}")
+        
+        return stdout
+    
+    @staticmethod
+    def _fix_wav_sizes(audio_data: bytes) -> bytes:
+        """Fill in the RIFF and data chunk sizes, which can't be back-patched when writing to a pipe"""
+        data_offset = audio_data.find(b"data", 12)
+        if not audio_data.startswith(b"RIFF") or data_offset == -1:
+            return b""
+        
+        audio = bytearray(audio_data)
+        struct.pack_into("<I", audio, 4, len(audio) - 8)
+        struct.pack_into("<I", audio, data_offset + 4, len(audio) - data_offset - 8)
+        return bytes(audio)
     
     async def _synthesize_fallback(self, text: str, session_id: str) -> TTSResponse:
         """Fallback TTS implementation"""
@@ -217,46 +411,91 @@ class MetalTTSService:
         # Generate silence
         audio_array = np.zeros(samples, dtype=np.int16)
         
-        # Convert to WAV bytes
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-            temp_path = temp_file.name
+        return TTSResponse(
+            audio_data=pcm16_to_wav(audio_array.tobytes(), sample_rate),
+            session_id=session_id,
+            format="wav",
+            sample_rate=sample_rate
+        )
+
+
+# Preallocated per-stream audio buffer: 10 seconds of 16 kHz 16-bit mono
+STREAM_BUFFER_BYTES = 10 * 16000 * 2
+
+# Trailing silence that ends an utterance: 0.8 seconds of 16 kHz 16-bit mono
+END_OF_UTTERANCE_BYTES = int(0.8 * 16000 * 2)
+
+
+@functools.lru_cache(maxsize=None)
+def silero_vad_available() -> bool:
+    """Whether a Silero VAD model can be loaded; says so once when falling back to the energy gate"""
+    available = torch is not None and (
+        Path(settings.silero_vad_model_path).exists() or load_silero_vad is not None
+    )
+    if not available:
+        print("ℹ️  Silero VAD unavailable (pip install silero-vad, or set SILERO_VAD_MODEL_PATH); "
+              "using the energy gate")
+    return available
+
+
+class VoiceActivityDetector:
+    """Per-stream speech/silence gate: Silero VAD when torch and the model are available, RMS energy otherwise"""
+    
+    SILERO_WINDOW = 512  # Samples per Silero call at 16 kHz
+    
+    def __init__(self, threshold: float = 0.5, energy_threshold: float = 0.01):
+        self.threshold = threshold
+        self.energy_threshold = energy_threshold
+        self.model = None
+        if silero_vad_available():
+            # Silero carries RNN state between calls, so every stream gets its own instance.
+            # A downloaded JIT model wins; otherwise use the one bundled with the silero-vad package
+            model_path = Path(settings.silero_vad_model_path)
+            self.model = torch.jit.load(str(model_path)) if model_path.exists() else load_silero_vad()
+            self.model.eval()
+        self.pending = np.zeros(0, dtype=np.float32)  # Samples short of a full Silero window
+        self.speaking = False  # Decision for the latest full window
+    
+    def reset(self):
+        """Forget buffered audio and model state, e.g. when an utterance ends"""
+        if self.model is not None:
+            self.model.reset_states()
+        self.pending = np.zeros(0, dtype=np.float32)
+        self.speaking = False
+    
+    def is_speech(self, samples: np.ndarray, sample_rate: int = 16000) -> bool:
+        """True if any part of the chunk looks like speech"""
+        if self.model is not None:
+            # Carry leftover samples into the next chunk so short frames still reach the model;
+            # a chunk too short to complete a window keeps the previous decision
+            samples = np.concatenate((self.pending, samples))
+            usable = len(samples) - len(samples) % self.SILERO_WINDOW
+            self.pending = samples[usable:]
+            if usable == 0:
+                return self.speaking
+            speech = False
+            with torch.no_grad():
+                for start in range(0, usable, self.SILERO_WINDOW):
+                    window = torch.from_numpy(samples[start:start + self.SILERO_WINDOW])
+                    self.speaking = self.model(window, sample_rate).item() >= self.threshold
+                    speech = speech or self.speaking
+            return speech
         
-        try:
-            # Write WAV file
-            with wave.open(temp_path, 'wb') as wav_file:
-                wav_file.setnchannels(1)  # Mono
-                wav_file.setsampwidth(2)  # 16-bit
-                wav_file.setframerate(sample_rate)
-                wav_file.writeframes(audio_array.tobytes())
-            
-            # Read back as bytes
-            with open(temp_path, "rb") as f:
-                audio_data = f.read()
-            
-            # Clean up
-            Path(temp_path).unlink(missing_ok=True)
-            
-            return TTSResponse(
-                audio_data=audio_data,
-                session_id=session_id,
-                format="wav",
-                sample_rate=sample_rate
-            )
-            
-        except Exception as e:
-            try:
-                Path(temp_path).unlink(missing_ok=True)
-            except:
-                pass
-            raise e
+        # Energy fallback over 30 ms frames
+        frame = int(sample_rate * 0.03)
+        usable = len(samples) - len(samples) % frame
+        if usable == 0:
+            return bool(len(samples)) and float(np.sqrt(np.mean(samples ** 2))) >= self.energy_threshold
+        rms = np.sqrt(np.mean(samples[:usable].reshape(-1, frame) ** 2, axis=1))
+        return bool((rms >= self.energy_threshold).any())
 
 
 class VoiceStreamManager:
     """Manages real-time voice streaming"""
     
-    def __init__(self):
-        self.stt_service = WhisperSTTService()
-        self.tts_service = MetalTTSService()
+    def __init__(self, stt_service: WhisperSTTService, tts_service: MetalTTSService):
+        self.stt_service = stt_service
+        self.tts_service = tts_service
         self.active_streams = {}
     
     async def start_voice_stream(self, session_id: str):
@@ -265,9 +504,20 @@ class VoiceStreamManager:
         if session_id in self.active_streams:
             return  # Already active
         
+        vad = await asyncio.to_thread(VoiceActivityDetector)  # May load a Silero model from disk
+        if session_id in self.active_streams:
+            return  # Started by a concurrent call while the model loaded
+        
         self.active_streams[session_id] = {
             "recording": False,
-            "audio_buffer": [],
+            "audio_buffer": bytearray(STREAM_BUFFER_BYTES),  # Preallocated, filled in place
+            "offset": 0,
+            "new_bytes": 0,  # Audio added since the last transcription round
+            "prev_hypothesis": [],  # Words from the previous round over the current window
+            "committed_words": 0,  # Leading words of the window already confirmed
+            "voiced": False,  # Whether the current window contains any speech
+            "silence_bytes": 0,  # Silence since the last speech in the window
+            "vad": vad,  # Per-stream so Silero's state never mixes sessions
             "sample_rate": 16000
         }
     
@@ -282,55 +532,141 @@ class VoiceStreamManager:
         session_id: str, 
         audio_chunk: bytes
     ) -> Optional[STTResponse]:
-        """Process an audio chunk and return transcription if complete"""
+        """Process an audio chunk and return any newly confirmed words"""
         
         if session_id not in self.active_streams:
             await self.start_voice_stream(session_id)
         
         stream = self.active_streams[session_id]
-        stream["audio_buffer"].append(audio_chunk)
         
-        # Check if we have enough audio for transcription
-        total_size = sum(len(chunk) for chunk in stream["audio_buffer"])
+        # Gate on voice activity so an idle mic never reaches Whisper
+        if stream["vad"].is_speech(pcm16_to_samples(audio_chunk), stream["sample_rate"]):
+            stream["voiced"] = True
+            stream["silence_bytes"] = 0
+        elif not stream["voiced"]:
+            return None  # Leading silence - nothing to transcribe yet
+        else:
+            stream["silence_bytes"] += len(audio_chunk)
+        end_of_utterance = stream["silence_bytes"] >= END_OF_UTTERANCE_BYTES
+        
+        buffer = stream["audio_buffer"]
+        offset = stream["offset"]
+        end = offset + len(audio_chunk)
+        if end > len(buffer):
+            # Oversized chunk - grow the buffer rather than drop audio
+            buffer.extend(bytes(end - len(buffer)))
+        buffer[offset:end] = audio_chunk
+        stream["offset"] = end
+        stream["new_bytes"] += len(audio_chunk)
         
-        # Process if we have at least 1 second of audio
+        # Run a round once we have at least 1 more second of audio
         min_size = stream["sample_rate"] * 2  # 16-bit samples
+        if stream["new_bytes"] < min_size and not end_of_utterance:
+            return None
+        stream["new_bytes"] = 0
         
-        if total_size >= min_size:
-            # Combine audio chunks
-            combined_audio = b"".join(stream["audio_buffer"])
-            stream["audio_buffer"] = []  # Clear buffer
-            
-            # Transcribe
-            return await self.stt_service.transcribe_audio(combined_audio, session_id)
+        # LocalAgreement-2: re-transcribe the whole window (not just the new audio) and
+        # confirm only the words that two consecutive rounds agree on
+        samples = pcm16_to_samples(memoryview(buffer)[:end])
+        result = await self.stt_service.transcribe_samples(samples, session_id)
+        hypothesis = result.text.split()
+        committed = stream["committed_words"]
+        
+        if end >= STREAM_BUFFER_BYTES or end_of_utterance:
+            # Utterance over, or no word timestamps to trim a full window by:
+            # commit everything heard and start a new window
+            confirmed = len(hypothesis)
+            stream["offset"] = 0
+            stream["prev_hypothesis"] = []
+            stream["committed_words"] = 0
+            stream["voiced"] = False
+            stream["silence_bytes"] = 0
+            if end_of_utterance:
+                stream["vad"].reset()
+        else:
+            confirmed = max(committed, self._agreed_prefix_length(stream["prev_hypothesis"], hypothesis))
+            stream["prev_hypothesis"] = hypothesis
+            stream["committed_words"] = confirmed
         
-        return None
+        new_words = hypothesis[committed:confirmed]
+        if not new_words:
+            return None
+        
+        result.text = " ".join(new_words)
+        return result
+    
+    @staticmethod
+    def _agreed_prefix_length(previous: List[str], current: List[str]) -> int:
+        """Number of leading words two hypotheses agree on (ignoring case and punctuation)"""
+        agreed = 0
+        for prev_word, word in zip(previous, current):
+            if prev_word.strip(".,!?").lower() != word.strip(".,!?").lower():
+                break
+            agreed += 1
+        return agreed
+
+
+def shared_instance(factory):
+    """Memoize a no-argument factory, building its instance at most once even when FastAPI
+    resolves the dependency from several threadpool threads at the same time"""
+    lock = threading.Lock()
+    
+    @functools.wraps(factory)
+    def get():
+        if get.instance is None:
+            with lock:
+                if get.instance is None:
+                    get.instance = factory()
+        return get.instance
+    
+    get.instance = None
+    return get
+
+
+# Global services, built on first use so importing this module never probes whisper.cpp
+@shared_instance
+def get_stt_service() -> WhisperSTTService:
+    """Shared STT service"""
+    return WhisperSTTService()
+
 
+@shared_instance
+def get_tts_service() -> MetalTTSService:
+    """Shared TTS service"""
+    return MetalTTSService()
 
-# Global services
-stt_service = WhisperSTTService()
-tts_service = MetalTTSService()
-voice_stream_manager = VoiceStreamManager()
+
+@shared_instance
+def get_voice_stream_manager() -> VoiceStreamManager:
+    """Shared voice stream manager, reusing the STT/TTS singletons"""
+    return VoiceStreamManager(get_stt_service(), get_tts_service())
 
 
 # FastAPI app for voice services
 voice_app = FastAPI(title="Hungry Agent Voice Services")
 
 
+@voice_app.on_event("shutdown")
+async def voice_shutdown():
+    """Stop the persistent whisper.cpp server"""
+    if get_stt_service.instance is not None:
+        await get_stt_service.instance.close()
+
+
 @voice_app.post("/stt", response_model=STTResponse)
-async def speech_to_text(request: STTRequest):
+async def speech_to_text(request: STTRequest, stt_service: WhisperSTTService = Depends(get_stt_service)):
     """Convert speech to text"""
     return await stt_service.transcribe_audio(request.audio_data, request.session_id)
 
 
 @voice_app.post("/tts", response_model=TTSResponse)
-async def text_to_speech(request: TTSRequest):
+async def text_to_speech(request: TTSRequest, tts_service: MetalTTSService = Depends(get_tts_service)):
     """Convert text to speech"""
     return await tts_service.synthesize_speech(request.text, request.session_id)
 
 
 @voice_app.get("/health")
-async def voice_health():
+async def voice_health(tts_service: MetalTTSService = Depends(get_tts_service)):
     """Health check for voice services"""
     return {
         "stt_available": True,
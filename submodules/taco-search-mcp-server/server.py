@@ -4,14 +4,23 @@ Fast Taco Search MCP Server
 Provides lightning-fast taco restaurant searches using SQLite database with simple keyword matching
 """
 
+import asyncio
+import functools
 import sqlite3
-import json
+import threading
+import re
 import sys
 import logging
 from typing import List, Dict, Any, Optional
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from mcp.server.fastmcp import FastMCP, Context
 
+try:
+    from rapidfuzz import fuzz, process, utils  # Optional: typo-tolerant name lookup as a last resort
+except ImportError:
+    process = None
+
 # Configure logging to stderr
 logging.basicConfig(
     level=logging.ERROR,  # Only show errors to reduce noise
@@ -28,13 +37,470 @@ mcp = FastMCP("taco_search")
 # Database path
 DB_PATH = Path(__file__).parent / "taco_restaurants.db"
 
-def get_db_connection():
-    """Get SQLite database connection"""
-    return sqlite3.connect(str(DB_PATH))
+def open_read_connection():
+    """Open a read-only connection; the loop thread and each DB worker get their own"""
+    conn = sqlite3.connect(
+        f"{DB_PATH.as_uri()}?mode=ro", uri=True, check_same_thread=False, cached_statements=256
+    )
+    conn.row_factory = sqlite3.Row  # C-level rows, still indexable by column name
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA mmap_size=1073741824")
+    conn.execute("PRAGMA query_only=1")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+# Full-text index over the searchable restaurant fields, kept in sync by triggers
+FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE taco_fts USING fts5(
+        name, address, best_taco,
+        content='taco_restaurants', content_rowid='rowid',
+        tokenize='porter unicode61 remove_diacritics 2'
+    );
+    INSERT INTO taco_fts(taco_fts) VALUES ('rebuild');
+
+    CREATE TRIGGER IF NOT EXISTS taco_fts_ai AFTER INSERT ON taco_restaurants BEGIN
+        INSERT INTO taco_fts(rowid, name, address, best_taco)
+        VALUES (new.rowid, new.name, new.address, new.best_taco);
+    END;
+    CREATE TRIGGER IF NOT EXISTS taco_fts_ad AFTER DELETE ON taco_restaurants BEGIN
+        INSERT INTO taco_fts(taco_fts, rowid, name, address, best_taco)
+        VALUES ('delete', old.rowid, old.name, old.address, old.best_taco);
+    END;
+    CREATE TRIGGER IF NOT EXISTS taco_fts_au AFTER UPDATE OF name, address, best_taco ON taco_restaurants BEGIN
+        INSERT INTO taco_fts(taco_fts, rowid, name, address, best_taco)
+        VALUES ('delete', old.rowid, old.name, old.address, old.best_taco);
+        INSERT INTO taco_fts(rowid, name, address, best_taco)
+        VALUES (new.rowid, new.name, new.address, new.best_taco);
+    END;
+"""
+
+# Per-restaurant review aggregates, recomputed by triggers whenever reviews change
+RATING_SCHEMA = """
+    ALTER TABLE taco_restaurants ADD COLUMN avg_rating REAL;
+    ALTER TABLE taco_restaurants ADD COLUMN review_count INTEGER NOT NULL DEFAULT 0;
+    CREATE INDEX IF NOT EXISTS idx_reviews_restaurant ON reviews(restaurant_id, date);
+
+    UPDATE taco_restaurants
+    SET avg_rating = stats.avg_rating, review_count = stats.review_count
+    FROM (
+        SELECT restaurant_id, ROUND(AVG(rating), 1) AS avg_rating, COUNT(*) AS review_count
+        FROM reviews
+        GROUP BY restaurant_id
+    ) AS stats
+    WHERE taco_restaurants.id = stats.restaurant_id;
+
+    CREATE TRIGGER IF NOT EXISTS reviews_stats_ai AFTER INSERT ON reviews BEGIN
+        UPDATE taco_restaurants SET
+            avg_rating = (SELECT ROUND(AVG(rating), 1) FROM reviews WHERE restaurant_id = new.restaurant_id),
+            review_count = (SELECT COUNT(*) FROM reviews WHERE restaurant_id = new.restaurant_id)
+        WHERE id = new.restaurant_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS reviews_stats_ad AFTER DELETE ON reviews BEGIN
+        UPDATE taco_restaurants SET
+            avg_rating = (SELECT ROUND(AVG(rating), 1) FROM reviews WHERE restaurant_id = old.restaurant_id),
+            review_count = (SELECT COUNT(*) FROM reviews WHERE restaurant_id = old.restaurant_id)
+        WHERE id = old.restaurant_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS reviews_stats_au AFTER UPDATE OF restaurant_id, rating ON reviews BEGIN
+        UPDATE taco_restaurants SET
+            avg_rating = (SELECT ROUND(AVG(rating), 1) FROM reviews WHERE restaurant_id = old.restaurant_id),
+            review_count = (SELECT COUNT(*) FROM reviews WHERE restaurant_id = old.restaurant_id)
+        WHERE id = old.restaurant_id;
+        UPDATE taco_restaurants SET
+            avg_rating = (SELECT ROUND(AVG(rating), 1) FROM reviews WHERE restaurant_id = new.restaurant_id),
+            review_count = (SELECT COUNT(*) FROM reviews WHERE restaurant_id = new.restaurant_id)
+        WHERE id = new.restaurant_id;
+    END;
+"""
+
+# Street part of the address (text before the first comma) for one-line listings
+STREET_SCHEMA = """
+    ALTER TABLE taco_restaurants ADD COLUMN street TEXT
+    GENERATED ALWAYS AS (substr(address, 1, instr(address || ',', ',') - 1)) VIRTUAL;
+"""
+
+# Opening hours split out of the hours JSON so lookups read plain columns
+DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+HOURS_FROM_JSON = ", ".join(f"{day.lower()} = json_extract(hours, '$.{day}')" for day in DAYS)
+HOURS_SCHEMA = "".join(f"ALTER TABLE taco_restaurants ADD COLUMN {day.lower()} TEXT;\n" for day in DAYS) + f"""
+    UPDATE taco_restaurants SET {HOURS_FROM_JSON} WHERE json_valid(hours);
+
+    CREATE TRIGGER IF NOT EXISTS taco_hours_ai AFTER INSERT ON taco_restaurants
+    WHEN json_valid(new.hours) BEGIN
+        UPDATE taco_restaurants SET {HOURS_FROM_JSON} WHERE rowid = new.rowid;
+    END;
+    CREATE TRIGGER IF NOT EXISTS taco_hours_au AFTER UPDATE OF hours ON taco_restaurants
+    WHEN json_valid(new.hours) BEGIN
+        UPDATE taco_restaurants SET {HOURS_FROM_JSON} WHERE rowid = new.rowid;
+    END;
+"""
+
+# The week's hours pre-formatted for the details response, one "  Day: hours" line per day
+HOURS_TEXT = " || char(10) || ".join(f"'  {day}: ' || coalesce(nullif({day.lower()}, ''), 'Closed')" for day in DAYS)
+HOURS_TEXT_SCHEMA = f"""
+    ALTER TABLE taco_restaurants ADD COLUMN hours_text TEXT
+    GENERATED ALWAYS AS (CASE WHEN hours <> '' THEN {HOURS_TEXT} END) VIRTUAL;
+"""
+
+# Full-text index over review text for menu item searches
+REVIEWS_FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE reviews_fts USING fts5(
+        text,
+        content='reviews', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    );
+    INSERT INTO reviews_fts(reviews_fts) VALUES ('rebuild');
+
+    CREATE TRIGGER IF NOT EXISTS reviews_fts_ai AFTER INSERT ON reviews BEGIN
+        INSERT INTO reviews_fts(rowid, text) VALUES (new.id, new.text);
+    END;
+    CREATE TRIGGER IF NOT EXISTS reviews_fts_ad AFTER DELETE ON reviews BEGIN
+        INSERT INTO reviews_fts(reviews_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    END;
+    CREATE TRIGGER IF NOT EXISTS reviews_fts_au AFTER UPDATE OF text ON reviews BEGIN
+        INSERT INTO reviews_fts(reviews_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        INSERT INTO reviews_fts(rowid, text) VALUES (new.id, new.text);
+    END;
+"""
+
+# Trigram index over name/address so substring lookups don't scan the table
+TRIGRAM_SCHEMA = """
+    CREATE VIRTUAL TABLE taco_trigram USING fts5(
+        name, address,
+        content='taco_restaurants', content_rowid='rowid',
+        tokenize='trigram'
+    );
+    INSERT INTO taco_trigram(taco_trigram) VALUES ('rebuild');
+
+    CREATE TRIGGER IF NOT EXISTS taco_trigram_ai AFTER INSERT ON taco_restaurants BEGIN
+        INSERT INTO taco_trigram(rowid, name, address) VALUES (new.rowid, new.name, new.address);
+    END;
+    CREATE TRIGGER IF NOT EXISTS taco_trigram_ad AFTER DELETE ON taco_restaurants BEGIN
+        INSERT INTO taco_trigram(taco_trigram, rowid, name, address)
+        VALUES ('delete', old.rowid, old.name, old.address);
+    END;
+    CREATE TRIGGER IF NOT EXISTS taco_trigram_au AFTER UPDATE OF name, address ON taco_restaurants BEGIN
+        INSERT INTO taco_trigram(taco_trigram, rowid, name, address)
+        VALUES ('delete', old.rowid, old.name, old.address);
+        INSERT INTO taco_trigram(rowid, name, address) VALUES (new.rowid, new.name, new.address);
+    END;
+"""
+
+# Plain indexes, safe to (re)create on every startup. The top-rated index only holds
+# restaurants that qualify for the list, so the tool reads exactly `limit` entries
+INDEX_SCHEMA = """
+    DROP INDEX IF EXISTS idx_restaurants_rating;
+    CREATE INDEX IF NOT EXISTS idx_restaurants_top_rated
+    ON taco_restaurants(avg_rating DESC, review_count DESC)
+    WHERE review_count >= 3;
+"""
+
+# Tool queries, kept as constants so the connection's statement cache reuses them
+SEARCH_SQL = """
+    SELECT r.id, r.name, r.address, r.street, r.best_taco,
+           r.review_count, r.avg_rating
+    FROM taco_fts f
+    JOIN taco_restaurants r ON r.rowid = f.rowid
+    WHERE taco_fts MATCH ?
+    ORDER BY r.avg_rating DESC, r.review_count DESC
+    LIMIT ?
+"""
+
+# Name lookups join the matched restaurant to its latest reviews in one statement:
+# one row per review, or a single row with NULL review columns if it has none.
+# Review text is cut one character past what the tool shows, so it can still tell when to add "..."
+WITH_REVIEWS = """
+    WITH r AS ({lookup})
+    SELECT r.*, substr(rev.text, 1, {text_chars}) AS text, rev.rating, rev.date
+    FROM r
+    LEFT JOIN reviews rev ON rev.restaurant_id = r.id
+    ORDER BY rev.date DESC
+    LIMIT {limit}
+"""
+
+DETAILS_SQL = WITH_REVIEWS.format(limit=3, text_chars=101, lookup="""
+    SELECT r.id, r.name, r.address, r.best_taco,
+           r.review_count, r.avg_rating, r.hours_text
+    FROM taco_fts f
+    JOIN taco_restaurants r ON r.rowid = f.rowid
+    WHERE taco_fts MATCH ?
+    ORDER BY LENGTH(r.name) ASC
+    LIMIT 1
+""")
+
+TOP_RATED_SQL = """
+    SELECT id, name, street, best_taco, review_count, avg_rating
+    FROM taco_restaurants
+    WHERE review_count >= 3
+    ORDER BY avg_rating DESC, review_count DESC
+    LIMIT ?
+"""
+
+MENU_ITEMS_SQL = """
+    SELECT r.id, r.name, r.street, r.best_taco, r.review_count, r.avg_rating
+    FROM taco_restaurants r
+    WHERE r.rowid IN (SELECT rowid FROM taco_fts WHERE taco_fts MATCH ?)
+       OR r.id IN (
+           SELECT rev.restaurant_id
+           FROM reviews_fts f
+           JOIN reviews rev ON rev.id = f.rowid
+           WHERE reviews_fts MATCH ?
+       )
+    ORDER BY r.avg_rating DESC, r.review_count DESC
+    LIMIT ?
+"""
+
+REVIEWS_SQL = WITH_REVIEWS.format(limit="?", text_chars=201, lookup="""
+    SELECT r.id, r.name
+    FROM taco_fts f
+    JOIN taco_restaurants r ON r.rowid = f.rowid
+    WHERE taco_fts MATCH ?
+    ORDER BY LENGTH(r.name) ASC
+    LIMIT 1
+""")
+
+# Substring fallbacks (trigram index) for queries the word index has no match for
+SEARCH_FALLBACK_SQL = """
+    SELECT r.id, r.name, r.address, r.street, r.best_taco, r.review_count, r.avg_rating
+    FROM taco_trigram t
+    JOIN taco_restaurants r ON r.rowid = t.rowid
+    WHERE taco_trigram MATCH ?
+    ORDER BY r.avg_rating DESC, r.review_count DESC
+    LIMIT ?
+"""
+
+DETAILS_FALLBACK_SQL = WITH_REVIEWS.format(limit=3, text_chars=101, lookup="""
+    SELECT r.id, r.name, r.address, r.best_taco, r.review_count, r.avg_rating, r.hours_text
+    FROM taco_trigram t
+    JOIN taco_restaurants r ON r.rowid = t.rowid
+    WHERE taco_trigram MATCH ?
+    ORDER BY LENGTH(r.name) ASC
+    LIMIT 1
+""")
+
+REVIEWS_FALLBACK_SQL = WITH_REVIEWS.format(limit="?", text_chars=201, lookup="""
+    SELECT r.id, r.name
+    FROM taco_trigram t
+    JOIN taco_restaurants r ON r.rowid = t.rowid
+    WHERE taco_trigram MATCH ?
+    ORDER BY LENGTH(r.name) ASC
+    LIMIT 1
+""")
+
+# Lookups for names matched in Python (RapidFuzz) rather than by an index
+RESTAURANT_NAMES_SQL = """
+    SELECT id, name FROM taco_restaurants
+"""
+
+DETAILS_BY_ID_SQL = WITH_REVIEWS.format(limit=3, text_chars=101, lookup="""
+    SELECT id, name, address, best_taco, review_count, avg_rating, hours_text
+    FROM taco_restaurants
+    WHERE id = ?
+""")
+
+REVIEWS_BY_ID_SQL = WITH_REVIEWS.format(limit="?", text_chars=201, lookup="""
+    SELECT id, name FROM taco_restaurants WHERE id = ?
+""")
+
+RESTAURANT_COUNT_SQL = "SELECT COUNT(*) as count FROM taco_restaurants"
+
+PING_SQL = "SELECT 1 FROM taco_restaurants LIMIT 1"
+
+def run_script(conn, script: str):
+    """Execute a multi-statement script inside the caller's transaction"""
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ""
+
+# Stored in the database's user_version; bump it whenever migrate_database gains a step
+SCHEMA_VERSION = 1
+
+def migrate_database():
+    """Bring an older taco database up to the schema the tools query (run with --migrate)"""
+    conn = sqlite3.connect(str(DB_PATH), isolation_level=None)
+    try:
+        # Serialize concurrent migrations so only one of them applies the steps
+        conn.execute("BEGIN IMMEDIATE")
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(taco_restaurants)")}
+        if "taco_fts" not in tables:
+            run_script(conn, FTS_SCHEMA)
+        if "avg_rating" not in columns:
+            run_script(conn, RATING_SCHEMA)
+        if "street" not in columns:
+            run_script(conn, STREET_SCHEMA)
+        if "mon" not in columns:
+            run_script(conn, HOURS_SCHEMA)
+        if "hours_text" not in columns:
+            run_script(conn, HOURS_TEXT_SCHEMA)
+        if "reviews_fts" not in tables:
+            run_script(conn, REVIEWS_FTS_SCHEMA)
+        if "taco_trigram" not in tables:
+            run_script(conn, TRIGRAM_SCHEMA)
+        run_script(conn, INDEX_SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+def fts_query(text: str, *columns: str) -> Optional[str]:
+    """Build an FTS5 MATCH expression that prefix-matches every word in text"""
+    tokens = re.findall(r"\w+", text.lower())
+    if not tokens:
+        return None
+    expression = " ".join(f'"{token}"*' for token in tokens)
+    if columns:
+        expression = f"{{{' '.join(columns)}}} : ({expression})"
+    return expression
+
+def trigram_query(text: str, *columns: str) -> Optional[str]:
+    """Build a trigram FTS5 MATCH expression for text as a substring (needs at least 3 characters)"""
+    text = text.strip()
+    if len(text) < 3:
+        return None
+    expression = '"' + text.replace('"', '""') + '"'
+    if columns:
+        expression = f"{{{' '.join(columns)}}} : {expression}"
+    return expression
+
+# Menu words voice users say that reviews usually spell differently
+MENU_SYNONYMS = {
+    "steak": ("carne asada", "bistec"),
+    "pork": ("carnitas", "al pastor"),
+    "chicken": ("pollo",),
+    "tongue": ("lengua",),
+    "tripe": ("tripa",),
+    "veggie": ("vegetarian",),
+}
+
+def menu_fts_query(text: str) -> Optional[str]:
+    """Build an FTS5 MATCH expression for a menu item phrase and its common synonyms"""
+    phrases = [text, *MENU_SYNONYMS.get(text.strip().lower(), ())]
+    terms = []
+    for phrase in phrases:
+        tokens = re.findall(r"\w+", phrase.lower())
+        if tokens:
+            terms.append(f'"{" ".join(tokens)}"*')
+    return " OR ".join(terms) or None
+
+def check_schema(conn):
+    """Fail fast on a database that predates the schema the tools query"""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version < SCHEMA_VERSION:
+        raise RuntimeError(
+            f"{DB_PATH.name} is at schema version {version}, expected {SCHEMA_VERSION}; "
+            f"run 'python server.py --migrate' to upgrade it"
+        )
 
-def dict_factory(cursor, row):
-    """Convert SQLite row to dictionary"""
-    return {col[0]: row[idx] for idx, col in enumerate(cursor.description)}
+# Setup step: `python server.py --migrate` upgrades the database and exits before serving
+if __name__ == "__main__" and sys.argv[1:] == ["--migrate"]:
+    migrate_database()
+    print(f"✅ {DB_PATH.name} migrated to schema version {SCHEMA_VERSION}", file=sys.stderr)
+    sys.exit(0)
+
+read_conn = open_read_connection()
+check_schema(read_conn)
+
+# SQLite work runs on a small worker pool so concurrent tool calls don't stall the event loop
+DB_WORKERS = 4
+db_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="taco-db")
+worker_state = threading.local()
+
+def worker_connection():
+    """Return the calling worker thread's read-only connection, opening it on first use"""
+    if not hasattr(worker_state, "conn"):
+        worker_state.conn = open_read_connection()
+    return worker_state.conn
+
+async def run_db(func, *args):
+    """Run a blocking database function on the worker pool"""
+    return await asyncio.get_running_loop().run_in_executor(db_executor, func, *args)
+
+# Tool bodies are memoized per argument tuple so repeat questions skip SQL and formatting.
+# Errors raise and are not cached; any commit to the database clears every cache.
+cached_tools = []
+db_version = None
+
+def tool_cache(func):
+    """Memoize a tool body and register it for invalidation"""
+    cached = functools.lru_cache(maxsize=512)(func)
+    cached_tools.append(cached)
+    return cached
+
+def clear_stale_caches():
+    """Drop memoized responses if another connection has changed the database since last call"""
+    global db_version
+    version = read_conn.execute("PRAGMA data_version").fetchone()["data_version"]
+    if version != db_version:
+        db_version = version
+        for cached in cached_tools:
+            cached.cache_clear()
+
+# Minimum plain edit-distance ratio (0-100) for a fuzzy name match to count, and how far it
+# must beat the next different name; partial/token-set scorers pick confident wrong matches
+FUZZY_NAME_CUTOFF = 90
+FUZZY_NAME_MARGIN = 10
+
+@tool_cache
+def restaurant_names() -> tuple:
+    """Load distinct (id, name) pairs once for fuzzy matching; cleared with the tool caches"""
+    rows = worker_connection().execute(RESTAURANT_NAMES_SQL).fetchall()
+    # Chains list one row per location; keep the first so duplicates don't compete with each other
+    first_ids = {}
+    for row in rows:
+        first_ids.setdefault(row['name'], row['id'])
+    return tuple((restaurant_id, name) for name, restaurant_id in first_ids.items())
+
+def fuzzy_restaurant_match(restaurant_name: str) -> Optional[tuple]:
+    """Return the (id, name) pair closest to a misspelled name, or None if no name clearly wins"""
+    if process is None:
+        return None
+    names = restaurant_names()
+    matches = process.extract(
+        restaurant_name, [name for _, name in names], scorer=fuzz.ratio,
+        processor=utils.default_process, limit=2
+    )
+    if not matches or matches[0][1] < FUZZY_NAME_CUTOFF:
+        return None
+    if len(matches) > 1 and matches[0][1] - matches[1][1] < FUZZY_NAME_MARGIN:
+        return None
+    return names[matches[0][2]]
+
+@tool_cache
+def search_restaurants_cached(query: str, limit: int) -> str:
+    """Find restaurants whose name or address matches query"""
+    cursor = worker_connection().cursor()
+    
+    # Search restaurants by name or address
+    match = fts_query(query, "name", "address")
+    results = []
+    if match:
+        cursor.execute(SEARCH_SQL, (match, limit))
+        results = cursor.fetchall()
+    if not results:
+        match = trigram_query(query, "name", "address")
+        if match:
+            cursor.execute(SEARCH_FALLBACK_SQL, (match, limit))
+            results = cursor.fetchall()
+    
+    if not results:
+        return f"No taco restaurants found matching '{query}'. Try searching for 'tacos', a restaurant name, or Austin area."
+    
+    # Format results for voice response
+    lines = [
+        f"{i}. {r['name']} - {r['street']}"
+        + (f" (★{r['avg_rating']}, {r['review_count']} reviews)" if r['avg_rating'] else "")
+        + (f" - Best: {r['best_taco']}" if r['best_taco'] and r['best_taco'] != 'Unknown' else "")
+        for i, r in enumerate(results, 1)
+    ]
+    return "\n".join([f"Found {len(results)} taco restaurants for '{query}':", *lines])
 
 @mcp.tool()
 async def search_restaurants(query: str, context: Context, limit: int = 10) -> str:
@@ -45,57 +511,65 @@ async def search_restaurants(query: str, context: Context, limit: int = 10) -> s
         limit: Maximum number of results to return (default: 10)
     """
     try:
-        with get_db_connection() as conn:
-            conn.row_factory = dict_factory
-            cursor = conn.cursor()
-            
-            # Search restaurants by name or address
-            search_query = f"%{query.lower()}%"
-            cursor.execute("""
-                SELECT r.id, r.name, r.address, r.best_taco,
-                       COUNT(rev.id) as review_count,
-                       ROUND(AVG(rev.rating), 1) as avg_rating
-                FROM taco_restaurants r
-                LEFT JOIN reviews rev ON r.id = rev.restaurant_id
-                WHERE LOWER(r.name) LIKE ? OR LOWER(r.address) LIKE ?
-                GROUP BY r.id, r.name, r.address, r.best_taco
-                ORDER BY avg_rating DESC, review_count DESC
-                LIMIT ?
-            """, (search_query, search_query, limit))
-            
-            results = cursor.fetchall()
-            
-            if not results:
-                return f"No taco restaurants found matching '{query}'. Try searching for 'tacos', a restaurant name, or Austin area."
-            
-            # Format results for voice response
-            response_parts = [f"Found {len(results)} taco restaurants for '{query}':"]
-            
-            for i, restaurant in enumerate(results, 1):
-                name = restaurant['name']
-                address = restaurant['address'].split(',')[0]  # Just street address
-                rating = restaurant['avg_rating'] or "No rating"
-                review_count = restaurant['review_count']
-                best_taco = restaurant['best_taco'] if restaurant['best_taco'] != 'Unknown' else None
-                
-                restaurant_info = f"{i}. {name} - {address}"
-                if rating != "No rating":
-                    restaurant_info += f" (★{rating}"
-                    if review_count > 0:
-                        restaurant_info += f", {review_count} reviews)"
-                    else:
-                        restaurant_info += ")"
-                
-                if best_taco:
-                    restaurant_info += f" - Best: {best_taco}"
-                
-                response_parts.append(restaurant_info)
-            
-            return "\n".join(response_parts)
-            
+        clear_stale_caches()
+        return await run_db(search_restaurants_cached, query, limit)
     except Exception as e:
         return f"Error searching for restaurants: {str(e)}"
 
+@tool_cache
+def get_restaurant_details_cached(restaurant_name: str) -> str:
+    """Look up one restaurant with hours and recent reviews"""
+    cursor = worker_connection().cursor()
+    
+    # Find restaurant by name (fuzzy match), fetched together with its recent reviews
+    match = fts_query(restaurant_name, "name")
+    rows = []
+    if match:
+        cursor.execute(DETAILS_SQL, (match,))
+        rows = cursor.fetchall()
+    if not rows:
+        match = trigram_query(restaurant_name, "name")
+        if match:
+            cursor.execute(DETAILS_FALLBACK_SQL, (match,))
+            rows = cursor.fetchall()
+    if not rows:
+        fuzzy = fuzzy_restaurant_match(restaurant_name)
+        if fuzzy:
+            cursor.execute(DETAILS_BY_ID_SQL, (fuzzy[0],))
+            rows = cursor.fetchall()
+    
+    if not rows:
+        return f"Restaurant '{restaurant_name}' not found. Try searching with 'search_restaurants' first."
+    
+    restaurant = rows[0]
+    reviews = [row for row in rows if row['text'] is not None]
+    
+    # Format detailed response
+    response_parts = [
+        f"🌮 {restaurant['name']}",
+        f"📍 {restaurant['address']}"
+    ]
+    
+    if restaurant['avg_rating']:
+        response_parts.append(f"⭐ {restaurant['avg_rating']}/5 ({restaurant['review_count']} reviews)")
+    
+    if restaurant['best_taco'] and restaurant['best_taco'] != 'Unknown':
+        response_parts.append(f"🏆 Best Taco: {restaurant['best_taco']}")
+    
+    if restaurant['hours_text']:
+        response_parts.extend(["🕒 Hours:", restaurant['hours_text']])
+    
+    # Add recent reviews
+    if reviews:
+        response_parts.append("\n💬 Recent Reviews:")
+        response_parts.extend([
+            f"  {'⭐' * int(review['rating']) if review['rating'] else ''} "
+            + (review['text'][:100] + "..." if len(review['text']) > 100 else review['text'])
+            for review in reviews
+        ])
+    
+    return "\n".join(response_parts)
+
 @mcp.tool()
 async def get_restaurant_details(restaurant_name: str, context: Context) -> str:
     """Get detailed information about a specific taco restaurant.
@@ -104,81 +578,31 @@ async def get_restaurant_details(restaurant_name: str, context: Context) -> str:
         restaurant_name: Name of the restaurant to get details for
     """
     try:
-        with get_db_connection() as conn:
-            conn.row_factory = dict_factory
-            cursor = conn.cursor()
-            
-            # Find restaurant by name (fuzzy match)
-            search_name = f"%{restaurant_name.lower()}%"
-            cursor.execute("""
-                SELECT r.id, r.name, r.address, r.hours, r.best_taco,
-                       COUNT(rev.id) as review_count,
-                       ROUND(AVG(rev.rating), 1) as avg_rating
-                FROM taco_restaurants r
-                LEFT JOIN reviews rev ON r.id = rev.restaurant_id
-                WHERE LOWER(r.name) LIKE ?
-                GROUP BY r.id, r.name, r.address, r.hours, r.best_taco
-                ORDER BY LENGTH(r.name) ASC
-                LIMIT 1
-            """, (search_name,))
-            
-            restaurant = cursor.fetchone()
-            
-            if not restaurant:
-                return f"Restaurant '{restaurant_name}' not found. Try searching with 'search_restaurants' first."
-            
-            # Get recent reviews
-            cursor.execute("""
-                SELECT text, rating, date
-                FROM reviews
-                WHERE restaurant_id = ?
-                ORDER BY date DESC
-                LIMIT 3
-            """, (restaurant['id'],))
-            
-            reviews = cursor.fetchall()
-            
-            # Format detailed response
-            response_parts = [
-                f"🌮 {restaurant['name']}",
-                f"📍 {restaurant['address']}"
-            ]
-            
-            if restaurant['avg_rating']:
-                response_parts.append(f"⭐ {restaurant['avg_rating']}/5 ({restaurant['review_count']} reviews)")
-            
-            if restaurant['best_taco'] and restaurant['best_taco'] != 'Unknown':
-                response_parts.append(f"🏆 Best Taco: {restaurant['best_taco']}")
-            
-            # Parse and format hours
-            try:
-                if restaurant['hours']:
-                    hours_data = json.loads(restaurant['hours'])
-                    hours_list = []
-                    for day, hours in hours_data.items():
-                        if hours:
-                            hours_list.append(f"{day}: {hours}")
-                        else:
-                            hours_list.append(f"{day}: Closed")
-                    if hours_list:
-                        response_parts.append("🕒 Hours:")
-                        response_parts.extend([f"  {h}" for h in hours_list])
-            except:
-                pass
-            
-            # Add recent reviews
-            if reviews:
-                response_parts.append("\n💬 Recent Reviews:")
-                for review in reviews:
-                    rating_stars = "⭐" * int(review['rating']) if review['rating'] else ""
-                    review_text = review['text'][:100] + "..." if len(review['text']) > 100 else review['text']
-                    response_parts.append(f"  {rating_stars} {review_text}")
-            
-            return "\n".join(response_parts)
-            
+        clear_stale_caches()
+        return await run_db(get_restaurant_details_cached, restaurant_name)
     except Exception as e:
         return f"Error getting restaurant details: {str(e)}"
 
+@tool_cache
+def get_top_rated_restaurants_cached(limit: int) -> str:
+    """List the best-rated restaurants with enough reviews"""
+    cursor = worker_connection().cursor()
+    
+    cursor.execute(TOP_RATED_SQL, (limit,))
+    
+    results = cursor.fetchall()
+    
+    if not results:
+        return "No highly-rated taco restaurants found with sufficient reviews."
+    
+    lines = [
+        f"{i}. {r['name']} - ⭐{r['avg_rating']} ({r['review_count']} reviews)"
+        + (f" - {r['best_taco']}" if r['best_taco'] and r['best_taco'] != 'Unknown' else "")
+        + f" - {r['street']}"
+        for i, r in enumerate(results, 1)
+    ]
+    return "\n".join([f"🏆 Top {len(results)} Rated Taco Restaurants in Austin:", *lines])
+
 @mcp.tool()
 async def get_top_rated_restaurants(context: Context, limit: int = 5) -> str:
     """Get the top-rated taco restaurants in Austin.
@@ -187,48 +611,38 @@ async def get_top_rated_restaurants(context: Context, limit: int = 5) -> str:
         limit: Number of top restaurants to return (default: 5)
     """
     try:
-        with get_db_connection() as conn:
-            conn.row_factory = dict_factory
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT r.id, r.name, r.address, r.best_taco,
-                       COUNT(rev.id) as review_count,
-                       ROUND(AVG(rev.rating), 1) as avg_rating
-                FROM taco_restaurants r
-                LEFT JOIN reviews rev ON r.id = rev.restaurant_id
-                GROUP BY r.id, r.name, r.address, r.best_taco
-                HAVING review_count >= 3
-                ORDER BY avg_rating DESC, review_count DESC
-                LIMIT ?
-            """, (limit,))
-            
-            results = cursor.fetchall()
-            
-            if not results:
-                return "No highly-rated taco restaurants found with sufficient reviews."
-            
-            response_parts = [f"🏆 Top {len(results)} Rated Taco Restaurants in Austin:"]
-            
-            for i, restaurant in enumerate(results, 1):
-                name = restaurant['name']
-                address = restaurant['address'].split(',')[0]
-                rating = restaurant['avg_rating']
-                review_count = restaurant['review_count']
-                best_taco = restaurant['best_taco'] if restaurant['best_taco'] != 'Unknown' else None
-                
-                restaurant_info = f"{i}. {name} - ⭐{rating} ({review_count} reviews)"
-                if best_taco:
-                    restaurant_info += f" - {best_taco}"
-                restaurant_info += f" - {address}"
-                
-                response_parts.append(restaurant_info)
-            
-            return "\n".join(response_parts)
-            
+        clear_stale_caches()
+        return await run_db(get_top_rated_restaurants_cached, limit)
     except Exception as e:
         return f"Error getting top-rated restaurants: {str(e)}"
 
+@tool_cache
+def get_restaurants_by_area_cached(area: str, limit: int) -> str:
+    """Find restaurants whose address matches area"""
+    cursor = worker_connection().cursor()
+    
+    match = fts_query(area, "address")
+    results = []
+    if match:
+        cursor.execute(SEARCH_SQL, (match, limit))
+        results = cursor.fetchall()
+    if not results:
+        match = trigram_query(area, "address")
+        if match:
+            cursor.execute(SEARCH_FALLBACK_SQL, (match, limit))
+            results = cursor.fetchall()
+    
+    if not results:
+        return f"No taco restaurants found in '{area}' area. Try searching for a different Austin neighborhood or street."
+    
+    lines = [
+        f"{i}. {r['name']} - {r['address']}"
+        + (f" (⭐{r['avg_rating']})" if r['avg_rating'] else "")
+        + (f" - {r['best_taco']}" if r['best_taco'] and r['best_taco'] != 'Unknown' else "")
+        for i, r in enumerate(results, 1)
+    ]
+    return "\n".join([f"🌮 Taco restaurants in {area} area:", *lines])
+
 @mcp.tool()
 async def get_restaurants_by_area(area: str, context: Context, limit: int = 8) -> str:
     """Search for taco restaurants in a specific Austin area or neighborhood.
@@ -238,49 +652,36 @@ async def get_restaurants_by_area(area: str, context: Context, limit: int = 8) -
         limit: Maximum number of results (default: 8)
     """
     try:
-        with get_db_connection() as conn:
-            conn.row_factory = dict_factory
-            cursor = conn.cursor()
-            
-            search_area = f"%{area.lower()}%"
-            cursor.execute("""
-                SELECT r.id, r.name, r.address, r.best_taco,
-                       COUNT(rev.id) as review_count,
-                       ROUND(AVG(rev.rating), 1) as avg_rating
-                FROM taco_restaurants r
-                LEFT JOIN reviews rev ON r.id = rev.restaurant_id
-                WHERE LOWER(r.address) LIKE ?
-                GROUP BY r.id, r.name, r.address, r.best_taco
-                ORDER BY avg_rating DESC, review_count DESC
-                LIMIT ?
-            """, (search_area, limit))
-            
-            results = cursor.fetchall()
-            
-            if not results:
-                return f"No taco restaurants found in '{area}' area. Try searching for a different Austin neighborhood or street."
-            
-            response_parts = [f"🌮 Taco restaurants in {area} area:"]
-            
-            for i, restaurant in enumerate(results, 1):
-                name = restaurant['name']
-                address = restaurant['address']
-                rating = restaurant['avg_rating'] or "No rating"
-                best_taco = restaurant['best_taco'] if restaurant['best_taco'] != 'Unknown' else None
-                
-                restaurant_info = f"{i}. {name} - {address}"
-                if rating != "No rating":
-                    restaurant_info += f" (⭐{rating})"
-                if best_taco:
-                    restaurant_info += f" - {best_taco}"
-                
-                response_parts.append(restaurant_info)
-            
-            return "\n".join(response_parts)
-            
+        clear_stale_caches()
+        return await run_db(get_restaurants_by_area_cached, area, limit)
     except Exception as e:
         return f"Error searching by area: {str(e)}"
 
+@tool_cache
+def search_menu_items_cached(query: str, limit: int) -> str:
+    """Find restaurants whose best taco or reviews mention query"""
+    cursor = worker_connection().cursor()
+    
+    # Search in reviews and best_taco fields
+    match = menu_fts_query(query)
+    results = []
+    if match:
+        cursor.execute(MENU_ITEMS_SQL, (f"best_taco : ({match})", match, limit))
+        results = cursor.fetchall()
+    
+    if not results:
+        return f"No restaurants found with '{query}' menu items. Try searching for 'beef', 'chicken', 'al pastor', 'carnitas', or other taco types."
+    
+    query_lc = query.lower()
+    lines = [
+        f"{i}. {r['name']} - {r['street']}"
+        + (f" (★{r['avg_rating']})" if r['avg_rating'] else "")
+        + (f" - Specialty: {r['best_taco']}"
+           if r['best_taco'] and r['best_taco'] != 'Unknown' and query_lc in r['best_taco'].lower() else "")
+        for i, r in enumerate(results, 1)
+    ]
+    return "\n".join([f"Found {len(results)} restaurants with '{query}' items:", *lines])
+
 @mcp.tool()
 async def search_menu_items(query: str, context: Context, limit: int = 15) -> str:
     """Search for specific taco types or menu items mentioned in reviews.
@@ -290,54 +691,49 @@ async def search_menu_items(query: str, context: Context, limit: int = 15) -> st
         limit: Maximum number of results (default: 15)
     """
     try:
-        with get_db_connection() as conn:
-            conn.row_factory = dict_factory
-            cursor = conn.cursor()
-            
-            # Search in reviews and best_taco fields
-            search_query = f"%{query.lower()}%"
-            cursor.execute("""
-                SELECT DISTINCT r.id, r.name, r.address, r.best_taco,
-                       COUNT(rev.id) as review_count,
-                       ROUND(AVG(rev.rating), 1) as avg_rating,
-                       GROUP_CONCAT(DISTINCT CASE 
-                           WHEN LOWER(rev.text) LIKE ? THEN SUBSTR(rev.text, 1, 100) 
-                           END, ' | ') as matching_reviews
-                FROM taco_restaurants r
-                LEFT JOIN reviews rev ON r.id = rev.restaurant_id
-                WHERE LOWER(r.best_taco) LIKE ? OR LOWER(rev.text) LIKE ?
-                GROUP BY r.id, r.name, r.address, r.best_taco
-                HAVING matching_reviews IS NOT NULL OR LOWER(r.best_taco) LIKE ?
-                ORDER BY avg_rating DESC, review_count DESC
-                LIMIT ?
-            """, (search_query, search_query, search_query, search_query, limit))
-            
-            results = cursor.fetchall()
-            
-            if not results:
-                return f"No restaurants found with '{query}' menu items. Try searching for 'beef', 'chicken', 'al pastor', 'carnitas', or other taco types."
-            
-            response_parts = [f"Found {len(results)} restaurants with '{query}' items:"]
-            
-            for i, restaurant in enumerate(results, 1):
-                name = restaurant['name']
-                address = restaurant['address'].split(',')[0]
-                rating = restaurant['avg_rating'] or "No rating"
-                best_taco = restaurant['best_taco'] if restaurant['best_taco'] != 'Unknown' else None
-                
-                restaurant_info = f"{i}. {name} - {address}"
-                if rating != "No rating":
-                    restaurant_info += f" (★{rating})"
-                if best_taco and query.lower() in best_taco.lower():
-                    restaurant_info += f" - Specialty: {best_taco}"
-                
-                response_parts.append(restaurant_info)
-            
-            return "\n".join(response_parts)
-            
+        clear_stale_caches()
+        return await run_db(search_menu_items_cached, query, limit)
     except Exception as e:
         return f"Error searching menu items: {str(e)}"
 
+@tool_cache
+def get_restaurant_reviews_cached(restaurant_name: str, limit: int) -> str:
+    """Fetch the latest reviews for one restaurant"""
+    cursor = worker_connection().cursor()
+    
+    # Find restaurant by name, fetched together with its reviews
+    match = fts_query(restaurant_name, "name")
+    rows = []
+    if match:
+        cursor.execute(REVIEWS_SQL, (match, limit))
+        rows = cursor.fetchall()
+    if not rows:
+        match = trigram_query(restaurant_name, "name")
+        if match:
+            cursor.execute(REVIEWS_FALLBACK_SQL, (match, limit))
+            rows = cursor.fetchall()
+    if not rows:
+        fuzzy = fuzzy_restaurant_match(restaurant_name)
+        if fuzzy:
+            cursor.execute(REVIEWS_BY_ID_SQL, (fuzzy[0], limit))
+            rows = cursor.fetchall()
+    
+    if not rows:
+        return f"Restaurant '{restaurant_name}' not found."
+    
+    restaurant = rows[0]
+    reviews = [row for row in rows if row['text'] is not None]
+    
+    if not reviews:
+        return f"No reviews found for {restaurant['name']}."
+    
+    lines = [
+        f"{i}. {'⭐' * int(review['rating']) if review['rating'] else 'No rating'} - "
+        + (review['text'][:200] + "..." if len(review['text']) > 200 else review['text'])
+        for i, review in enumerate(reviews, 1)
+    ]
+    return "\n".join([f"💬 Reviews for {restaurant['name']}:", *lines])
+
 @mcp.tool()
 async def get_restaurant_reviews(restaurant_name: str, context: Context, limit: int = 5) -> str:
     """Get reviews for a specific restaurant.
@@ -347,50 +743,19 @@ async def get_restaurant_reviews(restaurant_name: str, context: Context, limit:
         limit: Maximum number of reviews to return (default: 5)
     """
     try:
-        with get_db_connection() as conn:
-            conn.row_factory = dict_factory
-            cursor = conn.cursor()
-            
-            # Find restaurant by name
-            search_name = f"%{restaurant_name.lower()}%"
-            cursor.execute("""
-                SELECT id, name FROM taco_restaurants 
-                WHERE LOWER(name) LIKE ?
-                ORDER BY LENGTH(name) ASC
-                LIMIT 1
-            """, (search_name,))
-            
-            restaurant = cursor.fetchone()
-            
-            if not restaurant:
-                return f"Restaurant '{restaurant_name}' not found."
-            
-            # Get reviews
-            cursor.execute("""
-                SELECT text, rating, date
-                FROM reviews
-                WHERE restaurant_id = ?
-                ORDER BY date DESC
-                LIMIT ?
-            """, (restaurant['id'], limit))
-            
-            reviews = cursor.fetchall()
-            
-            if not reviews:
-                return f"No reviews found for {restaurant['name']}."
-            
-            response_parts = [f"💬 Reviews for {restaurant['name']}:"]
-            
-            for i, review in enumerate(reviews, 1):
-                rating_stars = "⭐" * int(review['rating']) if review['rating'] else "No rating"
-                review_text = review['text'][:200] + "..." if len(review['text']) > 200 else review['text']
-                response_parts.append(f"{i}. {rating_stars} - {review_text}")
-            
-            return "\n".join(response_parts)
-            
+        clear_stale_caches()
+        return await run_db(get_restaurant_reviews_cached, restaurant_name, limit)
     except Exception as e:
         return f"Error getting reviews: {str(e)}"
 
+def count_restaurants():
+    """Count restaurants through a worker connection"""
+    return worker_connection().execute(RESTAURANT_COUNT_SQL).fetchone()
+
+def ping_database():
+    """Cheapest query that proves the database is readable, for liveness probes"""
+    return worker_connection().execute(PING_SQL).fetchone()
+
 @mcp.tool()
 async def health_check(context: Context) -> str:
     """Simple health check that tests database connectivity.
@@ -400,11 +765,8 @@ async def health_check(context: Context) -> str:
     """
     try:
         # Test database connection
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) as count FROM taco_restaurants")
-            result = cursor.fetchone()
-            restaurant_count = result[0] if result else 0
+        result = await run_db(count_restaurants)
+        restaurant_count = result['count'] if result else 0
         
         return f"✅ Taco Search MCP Server is healthy! Database: {restaurant_count} restaurants"
         
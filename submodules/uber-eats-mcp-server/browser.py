@@ -1,5 +1,8 @@
-from typing import Awaitable, Callable
+import asyncio
+import sys
+from typing import Awaitable, Callable, Optional
 from browser_use import Agent, Browser, BrowserConfig
+from browser_use.browser.context import BrowserContext
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
@@ -14,44 +17,110 @@ warnings.filterwarnings("ignore")
 os.environ['BROWSERUSE_CONFIG_DIR'] = '/tmp/browseruse'
 os.makedirs('/tmp/browseruse', exist_ok=True)
 
-# Initialize browser config
-browser_config = BrowserConfig(
-    chrome_instance_path='/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',  # macOS path
-    headless=False,  # Run in visible mode for debugging
-    chrome_args=[
-        '--no-default-browser-check',
-        '--disable-default-apps', 
-        '--no-first-run',
-        '--disable-extensions',
-        '--disable-session-crashed-bubble',
-        '--disable-infobars',
-        '--start-maximized',
-        '--disable-web-security',
-        '--disable-features=VizDisplayCompositor'
-    ]
-)
-
 llm = ChatAnthropic(model_name="claude-3-5-sonnet-latest")
 
+# One browser shared by every agent run, so orders reuse the running browser process.
+# It uses browser-use's default Playwright setup, the same browser each agent used to launch for itself
+shared_browser = None
+
+def get_browser() -> Browser:
+    """Return the shared browser, creating it on first use"""
+    global shared_browser
+    if shared_browser is None:
+        shared_browser = Browser(config=BrowserConfig())
+    return shared_browser
+
+# At most two agents drive the browser at once; more just thrash the browser and slow every order.
+# Each agent checks out one of this many context slots, so the pool is also the limit. A slot
+# holds None until its context is first opened; after a clean run the context is reset and kept,
+# after a failed one it is closed and the slot goes back to None
+MAX_CONCURRENT_AGENTS = 2
+context_pool = asyncio.Queue()
+for _ in range(MAX_CONCURRENT_AGENTS):
+    context_pool.put_nowait(None)
+checked_out_contexts = set()  # Contexts in use by a running agent, so shutdown can close them too
+
+async def warm_browser():
+    """Launch the browser ahead of the first order; a failure here resurfaces on first real use"""
+    try:
+        await get_browser().get_playwright_browser()
+    except Exception as e:
+        print(f"⚠️ Browser warm-up failed: {e}", file=sys.stderr)
+
+async def reset_context(browser_context: BrowserContext):
+    """Clear cookies and park the page on about:blank so the next order starts from a clean state"""
+    session = await browser_context.get_session()
+    await session.context.clear_cookies()
+    page = await browser_context.get_current_page()
+    await page.goto("about:blank")
+
+async def release_context(browser_context: Optional[BrowserContext], reusable: bool):
+    """Return a context's slot to the pool, keeping the context only if it could be reset"""
+    checked_out_contexts.discard(browser_context)
+    if browser_context is not None:
+        try:
+            if reusable:
+                await reset_context(browser_context)
+            else:
+                await browser_context.close()
+        except Exception as e:
+            print(f"⚠️ Discarding browser context: {e}", file=sys.stderr)
+            reusable = False
+            try:
+                await browser_context.close()
+            except Exception:
+                pass
+    context_pool.put_nowait(browser_context if reusable else None)
+
+async def close_browser():
+    """Close the pooled and checked-out contexts and the shared browser"""
+    global shared_browser
+    for browser_context in list(checked_out_contexts):
+        await browser_context.close()
+    checked_out_contexts.clear()
+    for _ in range(context_pool.qsize()):
+        browser_context = context_pool.get_nowait()
+        if browser_context is not None:
+            await browser_context.close()
+        context_pool.put_nowait(None)
+    if shared_browser is not None:
+        await shared_browser.close()
+        shared_browser = None
+
 task_template = """
 perform the following task
 {task}
 """
 
-async def run_browser_agent(task: str, on_step: Callable[[], Awaitable[None]]):
-    """Run the browser-use agent with the specified task."""
-    import sys
+async def run_browser_agent(task: str, on_step: Callable[..., Awaitable[None]], timeout: Optional[float] = None):
+    """Run the browser-use agent with the specified task.
     
+    on_step is awaited after every agent step with browser-use's (state, model_output, step number).
+    timeout bounds the agent run itself; time spent waiting for a free browser slot doesn't count.
+    """
     try:
-        # Use the simple Agent approach that works
-        agent = Agent(
-            task=task_template.format(task=task),
-            llm=llm,
-        )
-
-        # Send progress updates to stderr so they don't interfere with JSON-RPC
-        print(f"🤖 Starting browser automation for task: {task[:100]}...", file=sys.stderr)
-        result = await agent.run()
+        browser_context: Optional[BrowserContext] = await context_pool.get()
+        try:
+            if browser_context is None:
+                browser_context = await get_browser().new_context()
+            checked_out_contexts.add(browser_context)
+            # Use the simple Agent approach that works, on a warm context that outlives the run
+            agent = Agent(
+                task=task_template.format(task=task),
+                llm=llm,
+                browser=get_browser(),
+                browser_context=browser_context,
+                register_new_step_callback=on_step,
+            )
+
+            # Send progress updates to stderr so they don't interfere with JSON-RPC
+            print(f"🤖 Starting browser automation for task: {task[:100]}...", file=sys.stderr)
+            result = await asyncio.wait_for(agent.run(), timeout)
+        except BaseException:
+            # Failed or timed out: the page may be half-navigated or wedged, so don't hand it on
+            await release_context(browser_context, reusable=False)
+            raise
+        await release_context(browser_context, reusable=True)
         print(f"✅ Browser automation completed successfully!", file=sys.stderr)
         
         return result.final_result()
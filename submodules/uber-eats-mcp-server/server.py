@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 import asyncio
+import os
 import sys
 import logging
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP, Context
-from browser import run_browser_agent
+from browser import run_browser_agent, warm_browser, close_browser
 
 # Load environment variables from .env file
 load_dotenv()
@@ -18,6 +20,9 @@ logging.basicConfig(
 
 # Redirect any remaining stdout prints from dependencies to stderr
 class StderrRedirect:
+    def __init__(self, rpc_buffer):
+        # The MCP stdio transport writes JSON-RPC to sys.stdout.buffer, so only that goes to the real stdout
+        self.buffer = rpc_buffer
     def write(self, text):
         if text.strip():  # Only redirect non-empty text
             sys.stderr.write(text)
@@ -27,35 +32,32 @@ class StderrRedirect:
 # Store original stdout for JSON-RPC
 original_stdout = sys.stdout
 
+@asynccontextmanager
+async def browser_lifespan(server: FastMCP):
+    """Launch the browser in the background at startup and close it when the server stops"""
+    warmup = asyncio.create_task(warm_browser())
+    try:
+        yield
+    finally:
+        warmup.cancel()
+        await close_browser()
+
 # Initialize FastMCP server
-mcp = FastMCP("uber_eats")
+mcp = FastMCP("uber_eats", lifespan=browser_lifespan)
 
 # In-memory storage for search results
 search_results = {}
 
+# Upper bound on one browser automation run, so a hung agent can't hold its browser slot forever.
+# Only the run itself counts, not time queued behind other orders for a slot
+BROWSER_TIMEOUT_S = float(os.getenv("BROWSER_TIMEOUT_S", "300"))
+
+# Minimum gap between step progress notifications; each one is a JSON-RPC message on stdio
+PROGRESS_INTERVAL_S = 1.0
+
 # REMOVED: find_menu_options tool - search functionality now handled by fast taco search MCP
 # This server now focuses purely on order fulfillment
 
-async def perform_search(request_id: str, search_term: str, delivery_address: str, task: str, context: Context):
-    """Perform the actual search in the background."""
-    try:
-        step_count = 0
-        
-        async def step_handler(*args, **kwargs):
-            nonlocal step_count
-            step_count += 1
-            await context.info(f"Step {step_count} completed")
-            await context.report_progress(step_count)
-        
-        result = await run_browser_agent(task=task, on_step=step_handler)
-        
-        search_results[request_id] = result
-    
-    except Exception as e:
-        # Store the error with the request ID
-        search_results[request_id] = f"Error: {str(e)}"
-        await context.error(f"Error searching for '{search_term}': {str(e)}")
-
 @mcp.resource(uri="resource://search_results/{request_id}")
 async def get_search_results(request_id: str) -> str:
     """Get the search results for a given request ID.
@@ -137,32 +139,30 @@ async def place_multiple_items_order(restaurant_name: str, items: list, context:
     
     items_summary = ", ".join(items_text)
     
-    task = f"""
-1. Go to https://www.ubereats.com
-2. Search for "{restaurant_name}" restaurant
-3. Click on {restaurant_name} from search results
-4. Add the following items to cart:
-"""
-    
-    for item in items:
-        item_name = item.get('name', '')
-        quantity = item.get('quantity', 1)
-        item_url = item.get('item_url', '')
-        
-        if item_url:
-            task += f"""
-   - Go to {item_url} and add {quantity}x {item_name}"""
-        else:
-            task += f"""
-   - Find "{item_name}" on menu and add {quantity} to cart"""
-    
-    task += f"""
-5. Navigate to cart/checkout
-6. Review all items in order
-7. Confirm delivery address: {delivery_address}
-8. Complete the order placement process
-9. Capture order confirmation details
-"""
+    # Open the restaurant page once and add every item from its menu, instead of a page load per item
+    entry_url = next((item.get('item_url', '') for item in items if item.get('item_url', '').startswith("http")), "")
+    if entry_url:
+        steps = [f"Go directly to {entry_url} (this opens the {restaurant_name} menu)"]
+    else:
+        steps = [
+            "Go to https://www.ubereats.com",
+            f'Search for "{restaurant_name}" restaurant',
+            f"Click on {restaurant_name} from search results",
+        ]
+    
+    items_steps = "".join(
+        f'\n   - Find "{item.get("name", "")}" on the menu, set quantity to {item.get("quantity", 1)}, and add it to cart'
+        for item in items
+    )
+    steps += [
+        f"Staying on this restaurant page, add the following items to cart:{items_steps}",
+        "Navigate to cart/checkout",
+        "Review all items in order",
+        f"Confirm delivery address: {delivery_address}",
+        "Complete the order placement process",
+        "Capture order confirmation details",
+    ]
+    task = "\n" + "\n".join(f"{i}. {step}" for i, step in enumerate(steps, 1)) + "\n"
     
     # Start the background task for ordering
     asyncio.create_task(
@@ -175,23 +175,40 @@ async def perform_order(restaurant_url: str, item_name: str, task: str, context:
     """Perform the actual food ordering in the background."""
     try:
         step_count = 0
+        reported_steps = 0
+        loop = asyncio.get_running_loop()
+        last_report = float("-inf")
         
         async def step_handler(*args, **kwargs):
-            nonlocal step_count
+            nonlocal step_count, reported_steps, last_report
             step_count += 1
-            await context.info(f"Order step {step_count} completed")
-            await context.report_progress(step_count)
+            if loop.time() - last_report >= PROGRESS_INTERVAL_S:
+                reported_steps, last_report = step_count, loop.time()
+                await context.info(f"Order step {step_count} completed")
+                await context.report_progress(step_count)
         
-        result = await run_browser_agent(task=task, on_step=step_handler)
+        result = await run_browser_agent(task=task, on_step=step_handler, timeout=BROWSER_TIMEOUT_S)
+        if step_count != reported_steps:
+            await context.report_progress(step_count)
         
         # Report completion
         await context.info(f"Order for '{item_name}' has been placed successfully!")
         return result
     
+    except asyncio.TimeoutError:
+        error_msg = f"Error ordering '{item_name}': timed out after {BROWSER_TIMEOUT_S:.0f}s"
+        await context.error(error_msg)
+        return error_msg
     except Exception as e:
         error_msg = f"Error ordering '{item_name}': {str(e)}"
         await context.error(error_msg)
         return error_msg
 
 if __name__ == "__main__":
+    # Keep the real stdout pipe for JSON-RPC and point fd 1 at stderr, so stray writes
+    # from dependencies (including native code) can't corrupt the protocol stream
+    sys.stdout.flush()
+    rpc_stdout = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = StderrRedirect(rpc_stdout)
     mcp.run(transport='stdio')
@@ -9,6 +9,11 @@ import os
 import time
 from datetime import datetime
 
+try:
+    import uvloop  # Optional: libuv event loop, cheaper task switching for the concurrent tests
+except ImportError:
+    uvloop = None
+
 # Add the orchestrator module to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'orchestrator'))
 
@@ -28,7 +33,7 @@ async def test_concurrent_requests():
         "spicy tacos"
     ]
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     # Create concurrent tasks
     tasks = []
@@ -41,7 +46,7 @@ async def test_concurrent_requests():
     # Wait for all tasks to complete
     results = await asyncio.gather(*tasks, return_exceptions=True)
     
-    end_time = time.time()
+    end_time = time.perf_counter()
     total_time = end_time - start_time
     
     print(f"\n📊 Test Results:")
@@ -84,7 +89,7 @@ async def test_concurrent_requests():
 async def test_single_request(request_id: str, query: str):
     """Test a single request with timeout"""
     print(f"🔵 {request_id}: Starting search for '{query}'")
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         # Test with timeout
@@ -93,7 +98,7 @@ async def test_single_request(request_id: str, query: str):
             timeout=30.0  # 30 second timeout
         )
         
-        end_time = time.time()
+        end_time = time.perf_counter()
         duration = end_time - start_time
         
         if result.success:
@@ -108,7 +113,7 @@ async def test_single_request(request_id: str, query: str):
         print(f"⏰ {request_id}: Timeout after 30 seconds")
         return {'success': False, 'error': 'timeout'}
     except Exception as e:
-        end_time = time.time()
+        end_time = time.perf_counter()
         duration = end_time - start_time
         print(f"💥 {request_id}: Exception after {duration:.2f}s - {e}")
         return {'success': False, 'duration': duration, 'error': str(e)}
@@ -171,4 +176,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
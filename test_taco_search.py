@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Tests for the taco search server's fuzzy restaurant name fallback
+"""
+
+import asyncio
+import importlib.util
+import os
+
+import pytest
+
+pytest.importorskip("rapidfuzz")
+
+SERVER_PATH = os.path.join(os.path.dirname(__file__), "submodules", "taco-search-mcp-server", "server.py")
+
+
+@pytest.fixture(scope="module")
+def server():
+    """Load the taco search server module the same way the orchestrator does"""
+    spec = importlib.util.spec_from_file_location("taco_search_mcp_server", SERVER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("typo, expected", [
+    ("granys tacos", "Granny's Tacos"),
+    ("veracruz all natral", "Veracruz All Natural"),
+    ("torchys tacos", "Torchy's Tacos"),
+])
+def test_misspelled_name_finds_restaurant(server, typo, expected):
+    match = server.fuzzy_restaurant_match(typo)
+    assert match is not None and match[1] == expected
+
+
+@pytest.mark.parametrize("near_miss", ["la barbacoa", "el arroyo"])
+def test_near_miss_name_is_not_found(server, near_miss):
+    # Restaurants that aren't in the database must not resolve to a similar-looking one
+    assert server.fuzzy_restaurant_match(near_miss) is None
+    details = asyncio.run(server.get_restaurant_details(near_miss, None))
+    assert details.startswith(f"Restaurant '{near_miss}' not found")
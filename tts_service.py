@@ -5,10 +5,11 @@ Uses system TTS capabilities
 """
 
 import asyncio
+import hashlib
 import json
-import subprocess
 import tempfile
 import os
+from collections import OrderedDict
 from datetime import datetime
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -37,8 +38,30 @@ class TTSResponse(BaseModel):
     session_id: str
     timestamp: str
 
-# Store generated audio files temporarily
-audio_files = {}
+# Generated audio files, keyed by a hash of (voice, text) and kept in LRU order so repeated
+# phrases are served without running 'say' again
+AUDIO_CACHE_SIZE = int(os.getenv("TTS_AUDIO_CACHE_SIZE", "256"))
+audio_files = OrderedDict()
+
+# Directory for generated audio. The in-memory cache starts empty, so clear out .wav files
+# left over from a previous run instead of letting them pile up
+TTS_DIR = os.getenv("TTS_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "hungry_tts")
+os.makedirs(TTS_DIR, exist_ok=True)
+for stale_name in os.listdir(TTS_DIR):
+    if stale_name.endswith('.wav'):
+        try:
+            os.unlink(os.path.join(TTS_DIR, stale_name))
+        except OSError:
+            pass
+
+async def run_say(*args: str) -> int:
+    """Run the 'say' command without blocking the event loop and return its exit code"""
+    process = await asyncio.create_subprocess_exec(
+        'say', *args,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    return await process.wait()
 
 @app.get("/")
 async def root():
@@ -53,34 +76,42 @@ async def synthesize_speech(request: TTSRequest):
     """Convert text to speech and return audio file URL"""
     
     try:
-        # Create temporary file for audio
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
+        file_id = hashlib.sha256(f"{request.voice}\x00{request.text}".encode()).hexdigest()
+        if file_id in audio_files:
+            audio_files.move_to_end(file_id)
+            return TTSResponse(
+                audio_url=f"/audio/{file_id}",
+                session_id=request.session_id,
+                timestamp=datetime.now().isoformat()
+            )
+        
+        # Create temporary file for audio next to its final <hash>.wav name
+        audio_path = os.path.join(TTS_DIR, f"{file_id}.wav")
+        temp_file = tempfile.NamedTemporaryFile(dir=TTS_DIR, delete=False, suffix='.wav')
         temp_file.close()
         
         # Use macOS built-in 'say' command for TTS
         # You can replace this with other TTS engines like espeak, festival, etc.
-        process = subprocess.run([
-            'say', 
-            '-o', temp_file.name,
-            '--data-format=LEF32@22050',
-            request.text
-        ], capture_output=True, text=True)
+        returncode = await run_say('-o', temp_file.name, '--data-format=LEF32@22050', request.text)
         
-        if process.returncode != 0:
+        if returncode != 0:
+            await asyncio.to_thread(os.unlink, temp_file.name)
             # Fallback: create a simple beep if TTS fails
-            subprocess.run(['say', 'TTS service ready'], capture_output=True)
+            await run_say('TTS service ready')
             raise HTTPException(status_code=500, detail="TTS synthesis failed")
         
-        # Store file reference
-        file_id = f"audio_{request.session_id}_{int(datetime.now().timestamp())}"
-        audio_files[file_id] = temp_file.name
+        # Atomically move into place; a concurrent request for the same text may have finished first
+        await asyncio.to_thread(os.replace, temp_file.name, audio_path)
+        audio_files[file_id] = audio_path
+        audio_files.move_to_end(file_id)
+        stale_files = []
         
-        # Clean up old files (keep only last 10)
-        if len(audio_files) > 10:
-            oldest_key = list(audio_files.keys())[0]
-            old_file = audio_files.pop(oldest_key)
+        # Clean up least recently used files
+        while len(audio_files) > AUDIO_CACHE_SIZE:
+            stale_files.append(audio_files.popitem(last=False)[1])
+        for old_file in stale_files:
             try:
-                os.unlink(old_file)
+                await asyncio.to_thread(os.unlink, old_file)
             except:
                 pass
         
@@ -117,9 +148,9 @@ async def speak_text(request: TTSRequest):
     
     try:
         # Use macOS 'say' command to speak immediately
-        process = subprocess.run(['say', request.text], capture_output=True, text=True)
+        returncode = await run_say(request.text)
         
-        if process.returncode != 0:
+        if returncode != 0:
             raise HTTPException(status_code=500, detail="TTS speak failed")
         
         return {"message": "Text spoken successfully", "text": request.text}
@@ -133,5 +164,7 @@ if __name__ == "__main__":
         "tts_service:app",
         host="127.0.0.1",
         port=5002,
-        reload=True
+        reload=os.getenv("TTS_DEV") == "1",
+        access_log=False,
+        log_level="warning"
     )